@@ -1,5 +1,5 @@
 import { useState, useEffect } from "react";
-import API_URL from "../config";
+import { fetchPortfolio } from "../utils/portfolio";
 
 function About() {
   const [aboutData, setAboutData] = useState({
@@ -9,9 +9,8 @@ function About() {
   });
 
   useEffect(() => {
-    fetch(`${API_URL}/api/about`)
-      .then((res) => res.json())
-      .then((data) => {
+    fetchPortfolio()
+      .then(({ about: data }) => {
         if (Array.isArray(data) && data.length > 0) {
           const about = data[0];
           setAboutData({
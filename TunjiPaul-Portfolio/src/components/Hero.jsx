@@ -1,5 +1,5 @@
 import { useEffect, useState } from "react";
-import API_URL from "../config";
+import { fetchPortfolio } from "../utils/portfolio";
 
 const defaultHero = {
   title: "Hello, I'm TunjiPaul!",
@@ -17,8 +17,7 @@ function Hero() {
   useEffect(() => {
     async function fetchHero() {
       try {
-        const res = await fetch(`${API_URL}/api/hero`);
-        const data = await res.json();
+        const { hero: data } = await fetchPortfolio();
         if (data.length > 0) {
           setHero(data[0]);
         } else {
@@ -1,7 +1,7 @@
 import { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
 import { FaGithub } from "react-icons/fa";
-import API_URL from "../config";
+import { fetchPortfolio } from "../utils/portfolio";
 function Projects() {
   const [projects, setProjects] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -14,9 +14,7 @@ function Projects() {
   const fetchProjects = async () => {
     try {
       setLoading(true);
-      const response = await fetch(`${API_URL}/api/projects`);
-      if (!response.ok) throw new Error("Failed to fetch projects");
-      const data = await response.json();
+      const { projects: data } = await fetchPortfolio();
       setProjects(data);
       setError(null);
     } catch (err) {
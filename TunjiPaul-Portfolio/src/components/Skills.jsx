@@ -1,7 +1,7 @@
 import { useState, useEffect } from "react";
 import * as FaIcons from "react-icons/fa";
 import * as SiIcons from "react-icons/si";
-import API_URL from "../config";
+import { fetchPortfolio } from "../utils/portfolio";
 
 const DefaultIcon = ({ className, style }) => (
   <div
@@ -89,10 +89,8 @@ export default function Skills() {
 
   const fetchSkills = async () => {
     try {
-      const response = await fetch(`${API_URL}/api/skills`);
-      if (!response.ok) throw new Error("Failed to fetch skills");
-
-      const data = await response.json();
+      const { skills } = await fetchPortfolio();
+      const data = Object.values(skills).flat();
 
       const groupedSkills = data.reduce((acc, skill) => {
         const category = skill.category || "Other";
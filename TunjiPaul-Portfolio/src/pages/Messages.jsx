@@ -11,10 +11,15 @@ import {
   User,
   Calendar,
   MessageSquare,
+  Search,
 } from "lucide-react";
 
 function Messages() {
   const [messages, setMessages] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [searchQuery, setSearchQuery] = useState("");
+  const [selectedIds, setSelectedIds] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [replyingTo, setReplyingTo] = useState(null);
@@ -109,8 +114,43 @@ function Messages() {
   const fetchMessages = async () => {
     try {
       setLoading(true);
-      const data = await apiRequest("/api/messages");
-      setMessages(data);
+      const page = await apiRequest("/api/messages");
+      setMessages(page.items);
+      setNextCursor(page.next_cursor);
+      setError(null);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const loadMoreMessages = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await apiRequest(
+        `/api/messages?cursor=${encodeURIComponent(nextCursor)}`
+      );
+      setMessages((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleSearch = async (e) => {
+    e.preventDefault();
+    const query = searchQuery.trim();
+    if (!query) return fetchMessages();
+    try {
+      setLoading(true);
+      const results = await apiRequest(
+        `/api/messages/search?q=${encodeURIComponent(query)}&limit=50`
+      );
+      setMessages(results);
+      setNextCursor(null);
       setError(null);
     } catch (err) {
       setError(err.message);
@@ -145,6 +185,41 @@ function Messages() {
     }
   };
 
+  const toggleSelected = (id) => {
+    setSelectedIds((current) =>
+      current.includes(id)
+        ? current.filter((selected) => selected !== id)
+        : [...current, id]
+    );
+  };
+
+  const runBulkAction = async (action) => {
+    if (
+      action === "delete" &&
+      !window.confirm(`Delete ${selectedIds.length} messages?`)
+    )
+      return;
+    try {
+      await apiRequest("/api/messages/bulk", {
+        method: "POST",
+        body: JSON.stringify({ action, ids: selectedIds }),
+      });
+      if (action === "mark_read") {
+        setMessages(
+          messages.map((msg) =>
+            selectedIds.includes(msg.id) ? { ...msg, is_read: true } : msg
+          )
+        );
+      } else {
+        // Archived and deleted messages both leave the inbox
+        setMessages(messages.filter((msg) => !selectedIds.includes(msg.id)));
+      }
+      setSelectedIds([]);
+    } catch (err) {
+      setError(err.message);
+    }
+  };
+
   const handleReplySubmit = async (e, messageId, recipientEmail) => {
     e.preventDefault();
     if (!replyText.trim()) return;
@@ -290,12 +365,57 @@ function Messages() {
           <Mail className="text-orange-600" /> Inbox
         </h2>
 
+        <form onSubmit={handleSearch} className="mb-6 flex gap-2">
+          <div className="relative flex-1">
+            <Search className="w-4 h-4 text-gray-400 absolute left-4 top-1/2 -translate-y-1/2" />
+            <input
+              type="search"
+              value={searchQuery}
+              onChange={(e) => setSearchQuery(e.target.value)}
+              placeholder="Search name, email, subject or message..."
+              className="w-full pl-10 pr-4 py-3 bg-white border border-gray-200 rounded-2xl text-sm focus:outline-none focus:border-orange-400"
+            />
+          </div>
+          <button
+            type="submit"
+            className="px-5 py-3 bg-orange-600 text-white rounded-2xl text-sm font-bold hover:bg-orange-700"
+          >
+            Search
+          </button>
+        </form>
+
         {error && (
           <div className="mb-4 p-4 bg-red-50 text-red-700 rounded-xl border border-red-100">
             {error}
           </div>
         )}
 
+        {selectedIds.length > 0 && (
+          <div className="mb-4 p-3 bg-white rounded-2xl border border-orange-200 flex flex-wrap items-center gap-2">
+            <span className="text-sm font-bold text-gray-700 mr-auto">
+              {selectedIds.length} selected
+            </span>
+            <button
+              onClick={() => runBulkAction("mark_read")}
+              className="px-4 py-2 bg-gray-100 rounded-xl text-sm font-bold text-gray-700 hover:bg-gray-200"
+            >
+              Mark read
+            </button>
+            <button
+              onClick={() => runBulkAction("archive")}
+              className="px-4 py-2 bg-gray-100 rounded-xl text-sm font-bold text-gray-700 hover:bg-gray-200"
+            >
+              Archive
+            </button>
+            <button
+              onClick={() => runBulkAction("delete")}
+              className="px-4 py-2 bg-red-50 rounded-xl text-sm font-bold text-red-600 hover:bg-red-100"
+            >
+              Delete
+            </button>
+          </div>
+        )}
+
         <div className="space-y-4">
           {loading ? (
             <div className="text-center py-20 bg-white rounded-2xl border border-dashed border-gray-300">
@@ -320,6 +440,12 @@ function Messages() {
                   <div className="flex-1">
                     {/* --- USER ICON INTEGRATED HERE --- */}
                     <div className="flex items-center gap-3 mb-2">
+                      <input
+                        type="checkbox"
+                        checked={selectedIds.includes(msg.id)}
+                        onChange={() => toggleSelected(msg.id)}
+                        className="w-4 h-4 accent-orange-600"
+                      />
                       <div className="w-10 h-10 bg-gray-100 rounded-full flex items-center justify-center text-gray-500">
                         <User className="w-5 h-5" />
                       </div>
@@ -422,6 +548,16 @@ function Messages() {
               </div>
             ))
           )}
+
+          {!loading && nextCursor && (
+            <button
+              onClick={loadMoreMessages}
+              disabled={loadingMore}
+              className="w-full py-3 bg-white border border-gray-200 rounded-2xl text-sm font-bold text-gray-600 hover:bg-gray-50 disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : "Load older messages"}
+            </button>
+          )}
         </div>
       </div>
     </div>
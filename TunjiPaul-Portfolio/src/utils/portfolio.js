@@ -0,0 +1,51 @@
+/**
+ * Portfolio Bundle
+ *
+ * Loads hero, about, projects, skills and document info for the home page
+ * from a single endpoint. Sections that mount together share the in-flight
+ * request, so the page makes one round trip instead of one per section.
+ *
+ * When VITE_STATIC_DATA_URL points at a static export (see
+ * backEnd/static_export.py), the bundle is read from there via its manifest
+ * and the backend is only used as a fallback.
+ */
+
+import API_URL from '../config';
+
+const STATIC_DATA_URL = import.meta.env.VITE_STATIC_DATA_URL;
+
+let pendingRequest = null;
+
+const fetchJson = async (url) => {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`Failed to fetch ${url}`);
+  return response.json();
+};
+
+const loadPortfolio = async () => {
+  if (STATIC_DATA_URL) {
+    try {
+      const manifest = await fetchJson(`${STATIC_DATA_URL}/manifest.json`);
+      const entry = manifest.files['/api/portfolio'];
+      return await fetchJson(`${STATIC_DATA_URL}/${entry.file}`);
+    } catch (err) {
+      console.warn('Static portfolio data unavailable, using the API:', err);
+    }
+  }
+  return fetchJson(`${API_URL}/api/portfolio`);
+};
+
+/**
+ * Fetch the home page bundle
+ *
+ * @returns {Promise<{hero: Array, about: Array, projects: Array, skills: Object, documents: Object}>}
+ */
+export const fetchPortfolio = () => {
+  if (!pendingRequest) {
+    pendingRequest = loadPortfolio().finally(() => {
+      // Later mounts refetch; the browser revalidates with the ETag
+      pendingRequest = null;
+    });
+  }
+  return pendingRequest;
+};
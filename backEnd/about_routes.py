@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
 from database import get_db, About
+from portfolio_cache import invalidate_portfolio_context
+from read_cache import read_cache, serialize_rows
+from row_writes import update_row, delete_row
 from auth_utils import get_current_user
 
 router = APIRouter(prefix="/api/about", tags=["About"])
@@ -41,9 +44,21 @@ class AboutResponse(AboutBase):
         from_attributes = True
 
 
+def load_about(db: Session) -> list:
+    """Serialized about sections, shared by the read cache and static export"""
+    return serialize_rows(AboutResponse, db.query(About).all())
+
+
 @router.get("", response_model=List[AboutResponse])
-def get_all_about(db: Session = Depends(get_db)):
-    return db.query(About).all()
+def get_all_about(
+    db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)
+):
+    return read_cache.response(
+        "/api/about",
+        ("about",),
+        lambda: load_about(db),
+        if_none_match=if_none_match,
+    )
 
 
 @router.get("/{about_id}", response_model=AboutResponse)
@@ -71,6 +86,7 @@ def create_about(
     )
     db.add(new_about)
     db.commit()
+    invalidate_portfolio_context("about")
     db.refresh(new_about)
     return new_about
 
@@ -82,21 +98,16 @@ def update_about(
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user),
 ):
-    db_about = db.query(About).filter(About.id == about_id).first()
-    if not db_about:
-        raise HTTPException(status_code=404, detail="About section not found")
-
     update_data = about.dict(exclude_unset=True)
 
     # Convert education items to dict format if present
     if "education" in update_data and update_data["education"] is not None:
         update_data["education"] = [edu.dict() for edu in about.education]
 
-    for key, value in update_data.items():
-        setattr(db_about, key, value)
-
-    db.commit()
-    db.refresh(db_about)
+    db_about = update_row(
+        db, About, about_id, update_data, not_found="About section not found"
+    )
+    invalidate_portfolio_context("about")
     return db_about
 
 
@@ -106,10 +117,6 @@ def delete_about(
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user),
 ):
-    db_about = db.query(About).filter(About.id == about_id).first()
-    if not db_about:
-        raise HTTPException(status_code=404, detail="About section not found")
-
-    db.delete(db_about)
-    db.commit()
+    delete_row(db, About, about_id, not_found="About section not found")
+    invalidate_portfolio_context("about")
     return None
@@ -0,0 +1,78 @@
+"""Store document content in a document_chunks table
+
+Revision ID: 697a4cd72b73
+Revises: 1469c6ab3828
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '697a4cd72b73'
+down_revision: Union[str, Sequence[str], None] = '1469c6ab3828'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match DOCUMENT_CHUNK_SIZE's default in document_storage.py
+CHUNK_SIZE = 256 * 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # create_tables() may have created the (empty) table already if the app
+    # started on this code before the migration ran
+    if not inspector.has_table('document_chunks'):
+        op.create_table('document_chunks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('start_byte', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('document_id', 'seq')
+        )
+
+    columns = {column['name'] for column in inspector.get_columns('documents')}
+    if 'content' not in columns:
+        return
+
+    # Split every existing PDF into chunks before dropping the BYTEA column
+    op.execute(
+        f"""
+        INSERT INTO document_chunks (document_id, seq, start_byte, data)
+        SELECT d.id, g.seq, g.seq * {CHUNK_SIZE},
+               substring(d.content FROM g.seq * {CHUNK_SIZE} + 1 FOR {CHUNK_SIZE})
+        FROM documents d
+        CROSS JOIN LATERAL generate_series(
+            0, (octet_length(d.content) - 1) / {CHUNK_SIZE}
+        ) AS g(seq)
+        WHERE octet_length(d.content) > 0
+          AND NOT EXISTS (
+              SELECT 1 FROM document_chunks c WHERE c.document_id = d.id
+          )
+        """
+    )
+    op.drop_column('documents', 'content')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('documents', sa.Column('content', sa.LargeBinary(), nullable=True))
+    op.execute(
+        """
+        UPDATE documents d SET content = (
+            SELECT string_agg(c.data, ''::bytea ORDER BY c.seq)
+            FROM document_chunks c
+            WHERE c.document_id = d.id
+        )
+        """
+    )
+    op.execute("UPDATE documents SET content = ''::bytea WHERE content IS NULL")
+    op.alter_column('documents', 'content', nullable=False)
+    op.drop_table('document_chunks')
@@ -0,0 +1,45 @@
+"""Add sha256 content hash to documents
+
+Revision ID: 8c41e2f0b7d9
+Revises: 697a4cd72b73
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e2f0b7d9'
+down_revision: Union[str, Sequence[str], None] = '697a4cd72b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {
+        column['name'] for column in sa.inspect(op.get_bind()).get_columns('documents')
+    }
+    # create_tables() adds the column on databases it created
+    if 'sha256' not in columns:
+        op.add_column('documents', sa.Column('sha256', sa.String(length=64), nullable=True))
+
+    # Backfill hashes for documents uploaded before this column existed
+    op.execute(
+        """
+        UPDATE documents d SET sha256 = (
+            SELECT encode(sha256(string_agg(c.data, ''::bytea ORDER BY c.seq)), 'hex')
+            FROM document_chunks c
+            WHERE c.document_id = d.id
+        )
+        WHERE d.sha256 IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'sha256')
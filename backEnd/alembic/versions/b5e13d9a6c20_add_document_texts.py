@@ -0,0 +1,43 @@
+"""Add document_texts table for extracted PDF text
+
+Revision ID: b5e13d9a6c20
+Revises: 8c41e2f0b7d9
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e13d9a6c20'
+down_revision: Union[str, Sequence[str], None] = '8c41e2f0b7d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # create_tables() may have created these already
+    if not inspector.has_table('document_texts'):
+        op.create_table('document_texts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('document_id', 'seq')
+        )
+    columns = {column['name'] for column in inspector.get_columns('documents')}
+    if 'text_sha256' not in columns:
+        op.add_column('documents', sa.Column('text_sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'text_sha256')
+    op.drop_table('document_texts')
@@ -0,0 +1,64 @@
+"""Add keyset pagination and prefix filter indexes
+
+Revision ID: d2a7f4c19e36
+Revises: b5e13d9a6c20
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a7f4c19e36"
+down_revision: Union[str, Sequence[str], None] = "b5e13d9a6c20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    indexes = [
+        ("ix_messages_created_at_id", "messages", ["created_at", "id"]),
+        (
+            "ix_messages_is_read_created_at_id",
+            "messages",
+            ["is_read", "created_at", "id"],
+        ),
+        ("ix_projects_created_at_id", "projects", ["created_at", "id"]),
+    ]
+    for name, table, columns in indexes:
+        # create_tables() may have created the index already
+        if not inspector.has_index(table, name):
+            op.create_index(name, table, columns, unique=False)
+
+    # Expression indexes for the case-insensitive prefix filters
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    prefix_indexes = [
+        ("ix_messages_lower_email", "messages", "email"),
+        ("ix_messages_lower_subject", "messages", "subject"),
+        ("ix_projects_lower_title", "projects", "title"),
+    ]
+    for name, table, column in prefix_indexes:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON {table} (lower({column}) text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in (
+        "ix_projects_lower_title",
+        "ix_messages_lower_subject",
+        "ix_messages_lower_email",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.drop_index("ix_projects_created_at_id", table_name="projects")
+    op.drop_index("ix_messages_is_read_created_at_id", table_name="messages")
+    op.drop_index("ix_messages_created_at_id", table_name="messages")
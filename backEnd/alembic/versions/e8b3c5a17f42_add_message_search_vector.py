@@ -0,0 +1,63 @@
+"""Add generated search_vector with GIN index to messages
+
+Revision ID: e8b3c5a17f42
+Revises: d2a7f4c19e36
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b3c5a17f42"
+down_revision: Union[str, Sequence[str], None] = "d2a7f4c19e36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # Postgres only; other databases use message_search's in-process index
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("messages")}
+    # create_tables() may have created the column and index already
+    if "search_vector" not in columns:
+        op.add_column(
+            "messages",
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(
+                    "setweight(to_tsvector('english', coalesce(name, '') || ' ' || "
+                    "coalesce(email, '')), 'A') || "
+                    "setweight(to_tsvector('english', coalesce(subject, '')), 'B') || "
+                    "setweight(to_tsvector('english', coalesce(message, '')), 'C')",
+                    persisted=True,
+                ),
+                nullable=True,
+            ),
+        )
+    if not inspector.has_index("messages", "ix_messages_search_vector"):
+        op.create_index(
+            "ix_messages_search_vector",
+            "messages",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_messages_search_vector", table_name="messages")
+    op.drop_column("messages", "search_vector")
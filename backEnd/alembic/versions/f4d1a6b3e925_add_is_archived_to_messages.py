@@ -0,0 +1,63 @@
+"""Add is_archived to messages and lead the listing indexes with it
+
+Revision ID: f4d1a6b3e925
+Revises: e8b3c5a17f42
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f4d1a6b3e925"
+down_revision: Union[str, Sequence[str], None] = "e8b3c5a17f42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("messages")}
+    # create_tables() adds the column on databases it created
+    if "is_archived" not in columns:
+        op.add_column(
+            "messages",
+            sa.Column(
+                "is_archived", sa.Boolean(), server_default=sa.false(), nullable=False
+            ),
+        )
+
+    # The inbox lists non-archived messages, so archived rows must not sit
+    # in the middle of the keyset scan
+    indexes = [
+        ("ix_messages_is_archived_created_at_id", ["is_archived", "created_at", "id"]),
+        (
+            "ix_messages_is_archived_is_read_created_at_id",
+            ["is_archived", "is_read", "created_at", "id"],
+        ),
+    ]
+    for name, index_columns in indexes:
+        if not inspector.has_index("messages", name):
+            op.create_index(name, "messages", index_columns, unique=False)
+    if inspector.has_index("messages", "ix_messages_is_read_created_at_id"):
+        op.drop_index("ix_messages_is_read_created_at_id", table_name="messages")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_messages_is_read_created_at_id",
+        "messages",
+        ["is_read", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_messages_is_archived_is_read_created_at_id", table_name="messages"
+    )
+    op.drop_index("ix_messages_is_archived_created_at_id", table_name="messages")
+    op.drop_column("messages", "is_archived")
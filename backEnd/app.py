@@ -8,14 +8,31 @@ import uvicorn
 import bcrypt
 import os
 from auth_utils import create_access_token, ACCESS_TOKEN_EXPIRE_HOURS
-from database import get_db, Base, engine, create_tables
-from hero_routes import router as hero_router
-from about_routes import router as about_router
-from projects_routes import router as project_router
-from messages_routes import router as message_router
-from skills_routes import router as skills_router
-from resume_routes import router as resume_router
-from chatbot_routes import router as chatbot_router
+from startup_timing import import_timer, print_startup_report, startup_report
+
+with import_timer("database"):
+    from database import get_db, Base, engine, create_tables
+with import_timer("hero_routes"):
+    from hero_routes import router as hero_router
+with import_timer("about_routes"):
+    from about_routes import router as about_router
+with import_timer("projects_routes"):
+    from projects_routes import router as project_router
+with import_timer("messages_routes"):
+    from messages_routes import router as message_router
+with import_timer("skills_routes"):
+    from skills_routes import router as skills_router
+with import_timer("resume_routes"):
+    from resume_routes import router as resume_router, MAX_UPLOAD_BODY_SIZE
+with import_timer("portfolio_routes"):
+    from portfolio_routes import router as portfolio_router
+with import_timer("chatbot_routes"):
+    from chatbot_routes import router as chatbot_router
+from rate_limit import RateLimitMiddleware
+from body_limit import BodySizeLimitMiddleware
+from static_export import STATIC_EXPORT_ON_WRITE, enable_export_on_write
+
+print_startup_report()
 
 
 try:
@@ -30,12 +47,21 @@ except Exception as e:
 
 app = FastAPI(title="My Personal Portfolio Backend", version="1.0.0")
 
+if STATIC_EXPORT_ON_WRITE:
+    enable_export_on_write()
+
 allowed_origins = os.getenv(
     "ALLOWED_ORIGINS",
     "http://localhost:5173,http://localhost:3000,http://localhost:5174,https://tunji-paul-portfolio.vercel.app,http://127.0.0.1:5173,http://127.0.0.1:3000",
 )
 origins = [origin.strip() for origin in allowed_origins.split(",")]
 
+# Added before CORS so 413/429 responses still carry CORS headers
+app.add_middleware(
+    BodySizeLimitMiddleware, limits={"/api/resume/upload": MAX_UPLOAD_BODY_SIZE}
+)
+app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -56,6 +82,7 @@ app.include_router(project_router)
 app.include_router(message_router)
 app.include_router(skills_router)
 app.include_router(resume_router)
+app.include_router(portfolio_router)
 app.include_router(chatbot_router)
 
 
@@ -77,6 +104,12 @@ def health_check():
     return {"status": "ok", "service": "portfolio-backend"}
 
 
+@app.get("/health/startup")
+def startup_timings():
+    """Per-module import timings recorded at boot"""
+    return startup_report()
+
+
 @app.post("/login")
 def login(user: UserLogin, db=Depends(get_db)):
     query = text("SELECT * FROM users WHERE email = :email")
@@ -0,0 +1,125 @@
+"""
+Read Cache Micro-Benchmark
+
+Measures the per-request CPU cost of GET /api/projects served the old way
+(rows validated through response_model and JSON-encoded on every request)
+against the read cache (pre-encoded bytes from read_cache.py).
+
+Both endpoints run in a throwaway FastAPI app and are driven straight through
+ASGI, so routing, dependency handling and response construction are counted
+but no network or database time is. Rows are synthetic.
+
+Usage:
+    python benchmark_read_cache.py [--rows 30] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+
+from projects_routes import ProjectResponse
+from read_cache import ReadCache, serialize_rows, orjson
+
+
+def make_rows(count: int) -> list:
+    """ORM-like project rows with realistic field sizes"""
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i,
+            title=f"Project {i}",
+            desc="Fullstack app using FastAPI, PostgreSQL and React. " * 4,
+            github=f"https://github.com/example/project-{i}",
+            demo=f"https://project-{i}.example.com",
+            image_url=f"https://res.cloudinary.com/example/image/upload/{i}.png",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(rows: list) -> FastAPI:
+    app = FastAPI()
+    cache = ReadCache(ttl_seconds=10**9)
+
+    @app.get("/before", response_model=list[ProjectResponse])
+    def before():
+        return rows
+
+    @app.get("/after", response_model=list[ProjectResponse])
+    def after():
+        return cache.response(
+            "/bench", ("bench",), lambda: serialize_rows(ProjectResponse, rows)
+        )
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    """Run one GET through the ASGI app and return the response body"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    """CPU microseconds per request, after a warm-up"""
+    for _ in range(50):
+        await call(app, path)
+    start = time.process_time()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.process_time() - start) / requests * 1_000_000
+
+
+async def main(rows: int, requests: int):
+    app = build_app(make_rows(rows))
+
+    before_body = await call(app, "/before")
+    after_body = await call(app, "/after")
+    assert json.loads(before_body) == json.loads(after_body), "bodies differ"
+
+    before = await measure(app, "/before", requests)
+    after = await measure(app, "/after", requests)
+
+    print(f"GET /api/projects with {rows} rows, {requests} requests each")
+    print(f"JSON encoder for refills: {'orjson' if orjson else 'json'}")
+    print(f"  response_model per request: {before:8.1f} us CPU")
+    print(f"  read cache (pre-encoded):   {after:8.1f} us CPU")
+    print(f"  speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.requests))
@@ -0,0 +1,86 @@
+"""
+Request Body Size Limits
+
+FastAPI parses multipart forms before the endpoint runs, so an endpoint can
+only check an upload's size after the whole body has been received. This
+ASGI middleware enforces per-route limits while the body arrives: requests
+announcing a larger Content-Length are refused up front, and bodies sent
+without one are cut off as soon as they pass the limit. Both get 413.
+"""
+
+from fastapi.responses import JSONResponse
+
+
+class BodyTooLarge(Exception):
+    """Raised from receive() once a request body passes its limit"""
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware that caps request body size for selected routes"""
+
+    def __init__(self, app, limits: dict[str, int]):
+        """
+        Args:
+            app: Wrapped ASGI app
+            limits: Maximum body size in bytes, keyed by exact request path
+        """
+        self.app = app
+        self.limits = limits
+
+    async def _reject(self, scope, receive, send, limit: int):
+        response = JSONResponse(
+            status_code=413,
+            content={
+                "detail": f"Request body exceeds maximum allowed size of {limit / 1024 / 1024:.1f}MB"
+            },
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > limit:
+                    await self._reject(scope, receive, send, limit)
+                    return
+                break
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            # The app may turn BodyTooLarge into its own error response
+            if exceeded and not started:
+                return
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except BodyTooLarge:
+            pass
+
+        if exceeded and not started:
+            await self._reject(scope, receive, send, limit)
@@ -0,0 +1,210 @@
+"""
+Bulk Operations
+
+Shared machinery for the admin bulk endpoints. A request is a list of
+create/update/delete operations. It is validated up front, with one query
+per check rather than one per item, and then applied in a single
+transaction with one batched statement per kind: a multi-row INSERT ...
+RETURNING, an executemany UPDATE keyed on id and a DELETE ... WHERE id IN.
+
+Bulk requests are all-or-nothing: if any operation fails validation, none
+is applied and the response lists the failing items.
+"""
+
+from typing import Callable, Generic, Literal, Optional, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from portfolio_cache import invalidate_portfolio_context
+
+MAX_BULK_OPERATIONS = 200
+
+T = TypeVar("T")
+
+
+class BulkOperation(BaseModel, Generic[T]):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    data: Optional[T] = None
+
+
+class BulkRequest(BaseModel, Generic[T]):
+    operations: list[BulkOperation[T]] = Field(
+        ..., min_length=1, max_length=MAX_BULK_OPERATIONS
+    )
+
+
+class BulkItemResult(BaseModel, Generic[T]):
+    index: int
+    op: str
+    id: int
+    item: Optional[T] = None
+
+
+class BulkResponse(BaseModel, Generic[T]):
+    results: list[BulkItemResult[T]]
+
+
+class BulkPlan:
+    """A bulk request split by kind, in request order"""
+
+    def __init__(self):
+        # (index, values) / (index, id, values) / (index, id)
+        self.creates: list[tuple[int, dict]] = []
+        self.updates: list[tuple[int, int, dict]] = []
+        self.deletes: list[tuple[int, int]] = []
+
+
+# Extra validation for a model: (db, plan) -> {index: error}
+BulkCheck = Callable[[Session, BulkPlan], dict[int, str]]
+
+
+def validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    field = ".".join(str(part) for part in first["loc"])
+    return f"{field}: {first['msg']}" if field else first["msg"]
+
+
+def plan_operations(
+    db: Session, model, request: BulkRequest, create_schema: type[BaseModel]
+) -> tuple[BulkPlan, dict[int, str]]:
+    """Split and validate operations, checking every targeted id in one query"""
+    plan, errors, targets = BulkPlan(), {}, {}
+    columns = model.__table__.columns
+    for index, operation in enumerate(request.operations):
+        values = operation.data.model_dump(exclude_unset=True) if operation.data else {}
+
+        if operation.op == "create":
+            try:
+                created = create_schema.model_validate(values)
+            except ValidationError as e:
+                errors[index] = validation_message(e)
+                continue
+            # Omitted optional fields fall back to the column defaults
+            plan.creates.append((index, created.model_dump(exclude_none=True)))
+            continue
+
+        if operation.id is None:
+            errors[index] = "id is required"
+        elif operation.id in targets.values():
+            errors[index] = "id appears more than once in this request"
+        elif operation.op == "update" and not values:
+            errors[index] = "No fields to update"
+        elif operation.op == "update" and (
+            required := [
+                name
+                for name, value in values.items()
+                if value is None and not columns[name].nullable
+            ]
+        ):
+            # Caught here rather than as a NOT NULL violation of the batch
+            errors[index] = f"{required[0]}: may not be null"
+        else:
+            targets[index] = operation.id
+            if operation.op == "update":
+                plan.updates.append((index, operation.id, values))
+            else:
+                plan.deletes.append((index, operation.id))
+
+    if targets:
+        found = set(
+            db.scalars(select(model.id).where(model.id.in_(set(targets.values()))))
+        )
+        for index, row_id in targets.items():
+            if row_id not in found:
+                errors[index] = f"{model.__name__} not found"
+    return plan, errors
+
+
+def apply_bulk(
+    db: Session,
+    model,
+    request: BulkRequest,
+    create_schema: type[BaseModel],
+    response_schema: type[BaseModel],
+    check: Optional[BulkCheck] = None,
+) -> dict:
+    """
+    Validate and apply a bulk request in one transaction.
+
+    Args:
+        db: Session to run in
+        model: Mapped class the operations target
+        request: The bulk request; operation data uses the update schema
+        create_schema: Schema a create operation's data must satisfy
+        response_schema: Schema for the returned items
+        check: Optional model-specific validation, e.g. unique names
+
+    Returns:
+        {"results": [...]} with one entry per operation, in request order
+
+    Raises:
+        HTTPException: 400 listing the failing operations; nothing is applied
+    """
+    plan, errors = plan_operations(db, model, request, create_schema)
+    if check is not None and not errors:
+        errors.update(check(db, plan))
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "No changes applied",
+                "errors": [
+                    {"index": index, "detail": errors[index]}
+                    for index in sorted(errors)
+                ],
+            },
+        )
+
+    ids = {}
+    try:
+        # Deletes first, so names they free up can be reused in this request
+        if plan.deletes:
+            db.execute(
+                delete(model).where(model.id.in_([row for _, row in plan.deletes]))
+            )
+        if plan.updates:
+            db.execute(
+                update(model),
+                [{"id": row_id, **values} for _, row_id, values in plan.updates],
+            )
+        if plan.creates:
+            created = db.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [values for _, values in plan.creates],
+            )
+            ids = {index: row_id for (index, _), row_id in zip(plan.creates, created)}
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Bulk changes conflict with existing data"
+        )
+    invalidate_portfolio_context(model.__tablename__)
+
+    ids.update({index: row_id for index, row_id, _ in plan.updates})
+    items = {}
+    if ids:
+        items = {
+            row.id: response_schema.model_validate(row)
+            for row in db.query(model).filter(model.id.in_(ids.values()))
+        }
+
+    # A deleted id may be reused by a create in the same request, so deleted
+    # operations are matched by index, never by id
+    deleted = dict(plan.deletes)
+    return {
+        "results": [
+            {
+                "index": index,
+                "op": operation.op,
+                "id": deleted[index] if index in deleted else ids[index],
+                "item": None if index in deleted else items[ids[index]],
+            }
+            for index, operation in enumerate(request.operations)
+        ]
+    }
@@ -0,0 +1,177 @@
+"""
+Token-Budgeted Chat History
+
+This module decides how much conversation history goes into each chatbot
+prompt. The most recent messages are sent verbatim, and older messages are
+collapsed into a short running summary so prompt size stays bounded however
+long a conversation runs.
+
+The summary is extractive (first sentence of each older message) so it costs
+no extra LLM call. It is cached per conversation and only the messages that
+slid out of the recent window since the last request are folded in.
+
+Token counts are estimated locally (about 4 characters per token) and every
+request is held to CHAT_INPUT_TOKEN_BUDGET.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+CHAT_INPUT_TOKEN_BUDGET = int(os.getenv("CHAT_INPUT_TOKEN_BUDGET", "3000"))
+HISTORY_RECENT_MESSAGES = int(os.getenv("HISTORY_RECENT_MESSAGES", "6"))
+HISTORY_SUMMARY_TOKENS = int(os.getenv("HISTORY_SUMMARY_TOKENS", "300"))
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_LINE_CHARS = 160
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for a piece of text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def message_tokens(message: dict) -> int:
+    """Rough token count for a chat message, including role overhead"""
+    return MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.get("content", ""))
+
+
+def message_fingerprint(message: dict) -> str:
+    """Identify a message so the summary can resume after it"""
+    data = f"{message.get('role')}:{message.get('content', '')}"
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def summarize_message(message: dict) -> str:
+    """Reduce a message to its first sentence, labelled with the speaker"""
+    speaker = "Visitor" if message.get("role") == "user" else "Assistant"
+    text = " ".join(message.get("content", "").split())
+    first = SENTENCE_END.split(text, maxsplit=1)[0]
+    if len(first) > SUMMARY_LINE_CHARS:
+        first = first[: SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+    return f"{speaker}: {first}"
+
+
+def trim_lines(lines: list[str], max_tokens: int) -> list[str]:
+    """Drop the oldest lines until the summary fits the token budget"""
+    total = sum(estimate_tokens(line) + 1 for line in lines)
+    start = 0
+    while start < len(lines) and total > max_tokens:
+        total -= estimate_tokens(lines[start]) + 1
+        start += 1
+    return lines[start:]
+
+
+class HistoryManager:
+    """Builds the history part of a prompt within a token budget"""
+
+    def __init__(
+        self,
+        recent_messages: int = HISTORY_RECENT_MESSAGES,
+        summary_tokens: int = HISTORY_SUMMARY_TOKENS,
+        token_budget: int = CHAT_INPUT_TOKEN_BUDGET,
+        max_conversations: int = 1000,
+    ):
+        self.recent_messages = recent_messages
+        self.summary_tokens = summary_tokens
+        self.token_budget = token_budget
+        self.max_conversations = max_conversations
+        self._lock = threading.Lock()
+        # conversation_id -> (fingerprint of last folded message, summary lines)
+        self._summaries = OrderedDict()
+        self.summary_updates = 0
+
+    def _summary_lines(self, conversation_id: str, older: list) -> list[str]:
+        with self._lock:
+            cached = self._summaries.get(conversation_id)
+
+        lines, start = [], 0
+        if cached is not None:
+            last_folded, cached_lines = cached
+            # Resume after the last message already folded into the summary
+            for i in range(len(older) - 1, -1, -1):
+                if message_fingerprint(older[i]) == last_folded:
+                    lines, start = cached_lines, i + 1
+                    break
+            if start == len(older):
+                return cached_lines
+
+        lines = trim_lines(
+            lines + [summarize_message(msg) for msg in older[start:]],
+            self.summary_tokens,
+        )
+        with self._lock:
+            self._summaries[conversation_id] = (
+                message_fingerprint(older[-1]),
+                lines,
+            )
+            self._summaries.move_to_end(conversation_id)
+            while len(self._summaries) > self.max_conversations:
+                self._summaries.popitem(last=False)
+            self.summary_updates += 1
+        return lines
+
+    def build(self, conversation_id: str, history: list, reserved_tokens: int) -> list:
+        """
+        Return the history messages to send with the next prompt.
+
+        Args:
+            conversation_id: Conversation the history belongs to
+            history: Full stored history, oldest first
+            reserved_tokens: Tokens already used by the system prompt and
+                the new user message
+
+        Returns:
+            An optional summary message followed by the most recent messages,
+            trimmed so the whole request stays within token_budget
+        """
+        remaining = self.token_budget - reserved_tokens
+        if remaining <= 0 or not history:
+            return []
+
+        recent = history[-self.recent_messages :] if self.recent_messages else []
+        older = history[: len(history) - len(recent)]
+
+        # Newest messages have priority; the summary gets what is left
+        kept = []
+        for message in reversed(recent):
+            cost = message_tokens(message)
+            if cost > remaining:
+                break
+            kept.append(message)
+            remaining -= cost
+        kept.reverse()
+
+        if not older:
+            return kept
+
+        lines = self._summary_lines(conversation_id, older)
+        lines = trim_lines(lines, remaining - MESSAGE_OVERHEAD_TOKENS)
+        if not lines:
+            return kept
+
+        summary = {
+            "role": "system",
+            "content": "Summary of earlier conversation:\n" + "\n".join(lines),
+        }
+        return [summary] + kept
+
+    def forget(self, conversation_id: str):
+        """Drop the cached summary for a cleared conversation"""
+        with self._lock:
+            self._summaries.pop(conversation_id, None)
+
+    def stats(self) -> dict:
+        """Return summary cache size and budget settings"""
+        with self._lock:
+            return {
+                "cached_summaries": len(self._summaries),
+                "summary_updates": self.summary_updates,
+                "recent_messages": self.recent_messages,
+                "token_budget": self.token_budget,
+            }
@@ -1,10 +1,20 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from langchain_groq import ChatGroq
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
 from sqlalchemy.orm import Session
-from database import get_db, Project, Skill, About, Hero, Document
+from database import SessionLocal, Project, Skill, About, Hero, Document
+from document_text import load_document_texts
+from portfolio_cache import get_portfolio_snapshot
+from retrieval_index import BM25Index
+from response_cache import ResponseCache
+from conversation_store import create_conversation_store, CONVERSATION_MAX_ENTRIES
+from chat_history import HistoryManager, estimate_tokens, message_tokens
+from auth_utils import get_current_user
+from llm_provider import get_llm, current_llm
+import asyncio
+import json
 import os
 import hashlib
 
@@ -14,18 +24,22 @@ groq_api_key = os.getenv("GROQ_API_KEY")
 if not groq_api_key:
     print("Warning: GROQ_API_KEY not set. Chatbot will not work.")
 
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",
-    temperature=0.7,
-    max_tokens=300,
-    api_key=groq_api_key,
-)
+# Bound concurrent Groq calls so a slow upstream can't pile up requests
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
 
-rate_limit_cache = defaultdict(list)
-MAX_REQUESTS_PER_MINUTE = 10
+# Number of retrieved portfolio chunks per prompt (0 = send the whole portfolio)
+CHATBOT_RETRIEVAL_TOP_K = int(os.getenv("CHATBOT_RETRIEVAL_TOP_K", "6"))
 
-conversation_memory = defaultdict(list)
 MAX_MEMORY_LENGTH = 20
+conversation_memory = create_conversation_store(max_messages=MAX_MEMORY_LENGTH * 2)
+
+# Recent turns verbatim plus a running summary, within a token budget
+history_manager = HistoryManager(max_conversations=CONVERSATION_MAX_ENTRIES)
+
+# Replies to first-turn questions, keyed by question and context version
+response_cache = ResponseCache()
 
 
 class ChatMessage(BaseModel):
@@ -38,77 +52,93 @@ class ChatResponse(BaseModel):
     conversation_id: str
 
 
-def check_rate_limit(ip_address: str):
-    """Check if IP has exceeded rate limit"""
-    now = datetime.now()
-
-    rate_limit_cache[ip_address] = [
-        ts for ts in rate_limit_cache[ip_address] if now - ts < timedelta(minutes=1)
+def project_chunks(db: Session) -> list[str]:
+    """One chunk per project"""
+    chunks = []
+    for proj in db.query(Project).all():
+        chunk = f"Project - {proj.title}: {proj.desc}\n"
+        if proj.github:
+            chunk += f"  GitHub: {proj.github}\n"
+        if proj.demo:
+            chunk += f"  Demo: {proj.demo}\n"
+        chunks.append(chunk)
+    return chunks
+
+
+def skill_chunks(db: Session) -> list[str]:
+    """One chunk per skill category"""
+    skills_by_category = {}
+    for skill in db.query(Skill).all():
+        category = skill.category or "Other"
+        if category not in skills_by_category:
+            skills_by_category[category] = []
+        skills_by_category[category].append(skill.name)
+
+    return [
+        f"Skills - {category}: {', '.join(skill_list)}\n"
+        for category, skill_list in skills_by_category.items()
     ]
 
-    if len(rate_limit_cache[ip_address]) >= MAX_REQUESTS_PER_MINUTE:
-        raise HTTPException(
-            status_code=429,
-            detail="Too many requests. Please wait a moment before trying again.",
-        )
-
-    rate_limit_cache[ip_address].append(now)
-
-
-def fetch_portfolio_context(db: Session) -> str:
-    """Fetch real-time data from database for RAG"""
-    context_parts = []
-
-    projects = db.query(Project).all()
-    if projects:
-        project_info = "Current Projects:\n"
-        for proj in projects:
-            project_info += f"- {proj.title}: {proj.desc}\n"
-            if proj.github:
-                project_info += f"  GitHub: {proj.github}\n"
-            if proj.demo:
-                project_info += f"  Demo: {proj.demo}\n"
-        context_parts.append(project_info)
-
-    skills = db.query(Skill).all()
-    if skills:
-        skills_by_category = {}
-        for skill in skills:
-            category = skill.category or "Other"
-            if category not in skills_by_category:
-                skills_by_category[category] = []
-            skills_by_category[category].append(skill.name)
-
-        skill_info = "Skills by Category:\n"
-        for category, skill_list in skills_by_category.items():
-            skill_info += f"- {category}: {', '.join(skill_list)}\n"
-        context_parts.append(skill_info)
 
+def about_chunks(db: Session) -> list[str]:
+    """One chunk per bio paragraph and per education entry"""
     about = db.query(About).first()
-    if about:
-        about_info = f"About:\n{about.content}\n"
-        if about.education:
-            about_info += "Education:\n"
-            for edu in about.education:
-                about_info += (
-                    f"- {edu.get('degree', '')} at {edu.get('institution', '')}\n"
-                )
-        context_parts.append(about_info)
+    if not about:
+        return []
+
+    chunks = [
+        f"About: {paragraph.strip()}\n"
+        for paragraph in (about.content or "").split("\n\n")
+        if paragraph.strip()
+    ]
+    for edu in about.education or []:
+        chunks.append(
+            f"Education: {edu.get('degree', '')} at {edu.get('institution', '')}\n"
+        )
+    return chunks
+
 
+def hero_chunks(db: Session) -> list[str]:
+    """The professional title and summary"""
     hero = db.query(Hero).first()
-    if hero:
-        hero_info = f"Professional Title: {hero.title}\n{hero.subtitle}\n"
-        context_parts.append(hero_info)
+    if not hero:
+        return []
+    return [f"Professional Title: {hero.title}\n{hero.subtitle}\n"]
 
-    documents = db.query(Document).all()
-    if documents:
-        doc_info = "Available Documents:\n"
-        for doc in documents:
-            doc_info += f"- {doc.type.upper()}: {doc.filename} (uploaded {doc.uploaded_at.strftime('%Y-%m-%d')})\n"
-        doc_info += "Visitors can download these from the portfolio website.\n"
-        context_parts.append(doc_info)
 
-    return "\n".join(context_parts)
+def document_chunks(db: Session) -> list[str]:
+    """The list of downloadable documents, plus their text extracted at upload"""
+    documents = db.query(Document.type, Document.filename, Document.uploaded_at).all()
+    if not documents:
+        return []
+
+    doc_info = "Available Documents (resume/CV):\n"
+    for doc in documents:
+        doc_info += f"- {doc.type.upper()}: {doc.filename} (uploaded {doc.uploaded_at.strftime('%Y-%m-%d')})\n"
+    doc_info += "Visitors can download these from the portfolio website.\n"
+
+    chunks = [doc_info]
+    for doc_type, texts in load_document_texts(db).items():
+        for i, content in enumerate(texts, 1):
+            chunks.append(f"From Tunji's {doc_type.upper()} (part {i}):\n{content}\n")
+    return chunks
+
+
+# Chunk builders keyed by the table name passed to invalidate_portfolio_context
+CHUNK_BUILDERS = {
+    "hero": hero_chunks,
+    "about": about_chunks,
+    "projects": project_chunks,
+    "skills": skill_chunks,
+    "documents": document_chunks,
+}
+
+# Always included so the assistant knows who it is talking about
+PINNED_SOURCES = ("hero",)
+
+# Used when nothing matches: greetings and "tell me about Tunji" are all
+# stopwords, so they get a short introduction rather than the whole portfolio
+DEFAULT_SOURCES = ("hero", "about")
 
 
 def get_system_prompt(db_context: str) -> str:
@@ -142,20 +172,136 @@ Instructions:
 Remember: You're here to help visitors learn about Tunji and encourage them to reach out!"""
 
 
-@router.post("/api/chatbot/message", response_model=ChatResponse)
-async def chat(message: ChatMessage, request: Request, db: Session = Depends(get_db)):
+def build_portfolio_index(previous: BM25Index | None, stale_tables: set | None):
+    """Rebuild the retrieval index, reloading only the tables that changed"""
+    if previous is not None and stale_tables is not None and not stale_tables:
+        return previous
+
+    tables = (
+        CHUNK_BUILDERS if previous is None or stale_tables is None else stale_tables
+    )
+    db = SessionLocal()
+    try:
+        updated = {
+            table: CHUNK_BUILDERS[table](db)
+            for table in CHUNK_BUILDERS
+            if table in tables
+        }
+    finally:
+        db.close()
+
+    if previous is None or stale_tables is None:
+        return BM25Index(updated)
+    return previous.with_sources(updated)
+
+
+def load_portfolio_index() -> tuple[BM25Index, int]:
     """
-    Send a message to the AI chatbot
+    Return the cached retrieval index and the context version it reflects,
+    opening a DB session only to refresh it
+    """
+    return get_portfolio_snapshot(build_portfolio_index)
+
+
+def fit_chunks(chunks: list[str], max_tokens: int | None) -> list[str]:
+    """Keep chunks, best first, while they fit in max_tokens"""
+    if max_tokens is None:
+        return chunks
+    kept, used = [], 0
+    for chunk in chunks:
+        # One extra token for the joining newline
+        cost = estimate_tokens(chunk) + 1
+        if used + cost <= max_tokens:
+            kept.append(chunk)
+            used += cost
+    return kept
+
+
+def select_context(
+    index: BM25Index, question: str, max_tokens: int | None = None
+) -> str:
+    """
+    Pick the portfolio chunks to ground a question on.
 
-    - Rate limited to 10 requests per minute per IP
-    - Maintains conversation context (last 5 messages)
-    - Uses RAG to fetch real-time data from database
-    - Returns AI-generated response about the portfolio
+    Pinned sources are always included, followed by the top
+    CHATBOT_RETRIEVAL_TOP_K chunks for the question. If nothing matches, the
+    first CHATBOT_RETRIEVAL_TOP_K hero and about chunks are used. If
+    retrieval is disabled, the whole portfolio is used. Either way only the
+    chunks that fit in max_tokens are kept.
     """
+    if CHATBOT_RETRIEVAL_TOP_K <= 0:
+        return "\n".join(fit_chunks(index.chunks(), max_tokens))
 
-    client_ip = request.client.host
-    check_rate_limit(client_ip)
+    matches = index.search(question, CHATBOT_RETRIEVAL_TOP_K)
+    if not matches:
+        defaults = [
+            chunk for source in DEFAULT_SOURCES for chunk in index.chunks(source)
+        ]
+        return "\n".join(fit_chunks(defaults[:CHATBOT_RETRIEVAL_TOP_K], max_tokens))
+
+    pinned = [chunk for source in PINNED_SOURCES for chunk in index.chunks(source)]
+    chunks = pinned + [chunk for chunk in matches if chunk not in pinned]
+    return "\n".join(fit_chunks(chunks, max_tokens))
+
+
+async def load_llm():
+    """Return the LLM client, building it in a worker thread on first use"""
+    llm = current_llm()
+    if llm is None:
+        llm = await run_in_threadpool(get_llm)
+    return llm
+
+
+async def invoke_llm(messages: list) -> str:
+    """
+    Call the LLM without blocking the event loop.
+
+    Waiting for a free slot and the Groq round trip itself both count
+    towards LLM_TIMEOUT_SECONDS.
+    """
+
+    async def call():
+        async with llm_semaphore:
+            llm = await load_llm()
+            response = await llm.ainvoke(messages)
+            return response.content
+
+    return await asyncio.wait_for(call(), timeout=LLM_TIMEOUT_SECONDS)
 
+
+async def stream_llm(messages: list):
+    """
+    Stream LLM tokens without blocking the event loop.
+
+    Shares the concurrency slots of invoke_llm. The deadline covers waiting
+    for a slot and the whole stream, and is checked between chunks.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LLM_TIMEOUT_SECONDS
+
+    await asyncio.wait_for(llm_semaphore.acquire(), timeout=LLM_TIMEOUT_SECONDS)
+    stream = None
+    try:
+        llm = await load_llm()
+        stream = llm.astream(messages)
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                chunk = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                break
+            if chunk.content:
+                yield chunk.content
+    finally:
+        llm_semaphore.release()
+        if stream is not None:
+            await stream.aclose()
+
+
+def validate_chat_message(message: ChatMessage, client_ip: str) -> str:
+    """Validate the user's message, returning the conversation id"""
     if not message.message or len(message.message.strip()) == 0:
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
@@ -164,39 +310,109 @@ async def chat(message: ChatMessage, request: Request, db: Session = Depends(get
             status_code=400, detail="Message too long (max 500 characters)"
         )
 
-    conversation_id = (
-        message.conversation_id or f"{client_ip}_{datetime.now().timestamp()}"
+    return message.conversation_id or f"{client_ip}_{datetime.now().timestamp()}"
+
+
+async def call_store(method, *args):
+    """Call a conversation store method, off the event loop if it blocks"""
+    if conversation_memory.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+
+async def prepare_chat(conversation_id: str, user_message: str) -> tuple:
+    """
+    Assemble the system prompt, recent history and the new user turn.
+
+    First-turn questions are looked up in the response cache first.
+
+    Returns:
+        Tuple of (LLM messages, cached reply or None, cache version). The
+        cache version is None when the turn has history and isn't cacheable.
+    """
+    index, version = await run_in_threadpool(load_portfolio_index)
+    history = await call_store(conversation_memory.get, conversation_id)
+
+    cache_version = None if history else version
+    if cache_version is not None:
+        cached = response_cache.get(user_message, cache_version)
+        if cached is not None:
+            return [], cached, cache_version
+
+    # Context gets what the prompt template and the question leave of the
+    # budget; history gets whatever the context leaves
+    user_turn = {"role": "user", "content": user_message}
+    template = {"role": "system", "content": get_system_prompt("")}
+    context_budget = (
+        history_manager.token_budget
+        - message_tokens(template)
+        - message_tokens(user_turn)
+    )
+    context = select_context(index, user_message, max(0, context_budget))
+    system_turn = {"role": "system", "content": get_system_prompt(context)}
+
+    messages = [system_turn]
+    reserved_tokens = message_tokens(system_turn) + message_tokens(user_turn)
+    messages.extend(history_manager.build(conversation_id, history, reserved_tokens))
+    messages.append(user_turn)
+    return messages, None, cache_version
+
+
+async def remember_exchange(conversation_id: str, user_message: str, ai_message: str):
+    """Append a completed user/assistant turn to the conversation memory"""
+    await call_store(
+        conversation_memory.append,
+        conversation_id,
+        [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": ai_message},
+        ],
     )
 
-    try:
-        portfolio_context = fetch_portfolio_context(db)
 
-        history = conversation_memory[conversation_id]
+def sse_event(data: dict, event: str | None = None) -> str:
+    """Format a Server-Sent Events frame"""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
 
-        messages = [{"role": "system", "content": get_system_prompt(portfolio_context)}]
 
-        for msg in history[-MAX_MEMORY_LENGTH:]:
-            messages.append(msg)
+@router.post("/api/chatbot/message", response_model=ChatResponse)
+async def chat(message: ChatMessage, request: Request):
+    """
+    Send a message to the AI chatbot
 
-        messages.append({"role": "user", "content": message.message})
+    - Rate limited per IP by RateLimitMiddleware (chatbot group)
+    - Maintains conversation context (recent turns plus a running summary,
+      within CHAT_INPUT_TOKEN_BUDGET)
+    - Uses BM25 retrieval over a cached portfolio index, refreshed when content changes
+    - Answers repeated first-turn questions from the response cache
+    - Calls the LLM asynchronously with bounded concurrency and a deadline
+    - Returns AI-generated response about the portfolio
+    """
 
-        response = llm.invoke(messages)
-        ai_message = response.content
+    client_ip = request.client.host
+    conversation_id = validate_chat_message(message, client_ip)
 
-        conversation_memory[conversation_id].append(
-            {"role": "user", "content": message.message}
-        )
-        conversation_memory[conversation_id].append(
-            {"role": "assistant", "content": ai_message}
+    try:
+        messages, ai_message, cache_version = await prepare_chat(
+            conversation_id, message.message
         )
 
-        if len(conversation_memory[conversation_id]) > MAX_MEMORY_LENGTH * 2:
-            conversation_memory[conversation_id] = conversation_memory[conversation_id][
-                -MAX_MEMORY_LENGTH * 2 :
-            ]
+        if ai_message is None:
+            ai_message = await invoke_llm(messages)
+            if cache_version is not None:
+                response_cache.put(message.message, cache_version, ai_message)
+
+        await remember_exchange(conversation_id, message.message, ai_message)
 
         return ChatResponse(response=ai_message, conversation_id=conversation_id)
 
+    except asyncio.TimeoutError:
+        print(f"Chatbot error: LLM call exceeded {LLM_TIMEOUT_SECONDS}s")
+        raise HTTPException(
+            status_code=504,
+            detail="Sorry, the response is taking too long. Please try again.",
+        )
     except Exception as e:
         print(f"Chatbot error: {str(e)}")
         raise HTTPException(
@@ -205,10 +421,84 @@ async def chat(message: ChatMessage, request: Request, db: Session = Depends(get
         )
 
 
+@router.post("/api/chatbot/stream")
+async def chat_stream(message: ChatMessage, request: Request):
+    """
+    Stream a chatbot reply as Server-Sent Events
+
+    - Same rate limit group, validation and context as /api/chatbot/message
+    - Emits a "start" event with the conversation id, then one "data"
+      frame per token, then a "done" event with the full response
+    - Errors after streaming has started are sent as an "error" event
+    - The completed reply is saved to the conversation memory
+    """
+
+    client_ip = request.client.host
+    conversation_id = validate_chat_message(message, client_ip)
+
+    async def event_stream():
+        yield sse_event({"conversation_id": conversation_id}, event="start")
+
+        parts = []
+        try:
+            messages, ai_message, cache_version = await prepare_chat(
+                conversation_id, message.message
+            )
+
+            if ai_message is not None:
+                yield sse_event({"token": ai_message})
+            else:
+                async for token in stream_llm(messages):
+                    parts.append(token)
+                    yield sse_event({"token": token})
+
+                ai_message = "".join(parts)
+                if cache_version is not None:
+                    response_cache.put(message.message, cache_version, ai_message)
+
+            await remember_exchange(conversation_id, message.message, ai_message)
+
+            yield sse_event(
+                {"response": ai_message, "conversation_id": conversation_id},
+                event="done",
+            )
+
+        except asyncio.TimeoutError:
+            print(f"Chatbot stream error: LLM call exceeded {LLM_TIMEOUT_SECONDS}s")
+            yield sse_event(
+                {"detail": "Sorry, the response is taking too long. Please try again."},
+                event="error",
+            )
+        except Exception as e:
+            print(f"Chatbot stream error: {str(e)}")
+            yield sse_event(
+                {
+                    "detail": "Sorry, I'm having trouble responding right now. Please try again later."
+                },
+                event="error",
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/api/chatbot/clear/{conversation_id}")
 async def clear_conversation(conversation_id: str):
     """Clear conversation history for a specific conversation"""
-    if conversation_id in conversation_memory:
-        del conversation_memory[conversation_id]
+    history_manager.forget(conversation_id)
+    if await call_store(conversation_memory.delete, conversation_id):
         return {"message": "Conversation cleared successfully"}
     return {"message": "Conversation not found"}
+
+
+@router.get("/api/chatbot/stats")
+async def chatbot_stats(current_user: str = Depends(get_current_user)):
+    """Report conversation store and response cache usage (Admin only)"""
+    return {
+        "conversations": await call_store(conversation_memory.stats),
+        "history": history_manager.stats(),
+        "response_cache": response_cache.stats(),
+    }
@@ -0,0 +1,276 @@
+"""
+Chatbot Conversation Store
+
+This module keeps chatbot conversation history behind a small store interface
+so it can't grow without bound. Every backend caps the number of
+conversations (least recently used ones are evicted first), expires
+conversations that have been idle longer than a TTL, and trims each history
+to a maximum number of messages.
+
+Two backends are provided:
+- InMemoryConversationStore: per-process, fastest, lost on restart
+- SQLiteConversationStore: a shared SQLite file so every uvicorn worker on
+  the host sees the same history
+
+Select one with CONVERSATION_STORE=memory|sqlite.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+CONVERSATION_STORE = os.getenv("CONVERSATION_STORE", "memory")
+CONVERSATION_STORE_PATH = os.getenv("CONVERSATION_STORE_PATH", "conversations.db")
+CONVERSATION_MAX_ENTRIES = int(os.getenv("CONVERSATION_MAX_ENTRIES", "1000"))
+CONVERSATION_TTL_SECONDS = int(os.getenv("CONVERSATION_TTL_SECONDS", "3600"))
+
+# Rough per-message overhead (dict, keys, role string) used for accounting
+MESSAGE_OVERHEAD_BYTES = 120
+
+
+def estimate_size(messages: list) -> int:
+    """Approximate the memory held by a list of chat messages, in bytes"""
+    return sum(MESSAGE_OVERHEAD_BYTES + len(msg.get("content", "")) for msg in messages)
+
+
+class ConversationStore(ABC):
+    """Interface shared by all conversation store backends"""
+
+    # True if calls do blocking I/O and must run off the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_messages: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+
+    @abstractmethod
+    def get(self, conversation_id: str) -> list:
+        """Return the message history for a conversation (empty if unknown)"""
+
+    @abstractmethod
+    def append(self, conversation_id: str, messages: list) -> None:
+        """Append messages to a conversation, trimming to max_messages"""
+
+    @abstractmethod
+    def delete(self, conversation_id: str) -> bool:
+        """Remove a conversation, returning True if it existed"""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Return entry counts, memory usage and eviction counters"""
+
+
+class InMemoryConversationStore(ConversationStore):
+    """Per-process store backed by an LRU-ordered dictionary"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, max_messages: int):
+        super().__init__(max_entries, ttl_seconds, max_messages)
+        self._lock = threading.Lock()
+        # conversation_id -> (last_access, messages, size); least recent first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+
+    def _expire(self, now: float):
+        # Entries are ordered by last access, so expired ones sit at the front
+        while self._entries:
+            conversation_id, (last_access, _, size) = next(iter(self._entries.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+            del self._entries[conversation_id]
+            self._total_bytes -= size
+            self._evicted_ttl += 1
+
+    def get(self, conversation_id: str) -> list:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(conversation_id)
+            if entry is None:
+                return []
+            _, messages, size = entry
+            self._entries[conversation_id] = (now, messages, size)
+            self._entries.move_to_end(conversation_id)
+            return list(messages)
+
+    def append(self, conversation_id: str, messages: list) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            _, history, old_size = self._entries.pop(conversation_id, (now, [], 0))
+            history = (history + list(messages))[-self.max_messages :]
+            size = estimate_size(history)
+            self._entries[conversation_id] = (now, history, size)
+            self._total_bytes += size - old_size
+
+            while len(self._entries) > self.max_entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self._evicted_lru += 1
+
+    def delete(self, conversation_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(conversation_id, None)
+            if entry is None:
+                return False
+            self._total_bytes -= entry[2]
+            return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "backend": "memory",
+                "conversations": len(self._entries),
+                "messages": sum(len(e[1]) for e in self._entries.values()),
+                "approx_bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "evicted_lru": self._evicted_lru,
+                "evicted_ttl": self._evicted_ttl,
+            }
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Store shared between worker processes through a SQLite file"""
+
+    blocking = True
+
+    # Run the TTL/LRU sweep at most this often per process
+    SWEEP_INTERVAL_SECONDS = 30
+
+    def __init__(
+        self, path: str, max_entries: int, ttl_seconds: int, max_messages: int
+    ):
+        super().__init__(max_entries, ttl_seconds, max_messages)
+        self.path = path
+        self._local = threading.local()
+        self._last_sweep = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id TEXT PRIMARY KEY,
+                    messages TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_conversations_updated_at "
+                "ON conversations (updated_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections aren't thread-safe
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _sweep(self, conn: sqlite3.Connection, now: float):
+        if now - self._last_sweep < self.SWEEP_INTERVAL_SECONDS:
+            return
+        self._last_sweep = now
+        conn.execute(
+            "DELETE FROM conversations WHERE updated_at < ?",
+            (now - self.ttl_seconds,),
+        )
+        conn.execute(
+            """
+            DELETE FROM conversations WHERE id IN (
+                SELECT id FROM conversations
+                ORDER BY updated_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def get(self, conversation_id: str) -> list:
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT messages FROM conversations WHERE id = ? AND updated_at >= ?",
+            (conversation_id, now - self.ttl_seconds),
+        ).fetchone()
+        return json.loads(row[0]) if row else []
+
+    def append(self, conversation_id: str, messages: list) -> None:
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            # Take the write lock up front so concurrent appends don't interleave
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT messages FROM conversations WHERE id = ? AND updated_at >= ?",
+                (conversation_id, now - self.ttl_seconds),
+            ).fetchone()
+            history = json.loads(row[0]) if row else []
+            history = (history + list(messages))[-self.max_messages :]
+            conn.execute(
+                """
+                INSERT INTO conversations (id, messages, size, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    messages = excluded.messages,
+                    size = excluded.size,
+                    updated_at = excluded.updated_at
+                """,
+                (conversation_id, json.dumps(history), estimate_size(history), now),
+            )
+            self._sweep(conn, now)
+
+    def delete(self, conversation_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM conversations WHERE id = ?", (conversation_id,)
+            )
+        return cursor.rowcount > 0
+
+    def stats(self) -> dict:
+        now = time.time()
+        conn = self._connect()
+        count, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM conversations "
+            "WHERE updated_at >= ?",
+            (now - self.ttl_seconds,),
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "conversations": count,
+            "approx_bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def create_conversation_store(max_messages: int) -> ConversationStore:
+    """Build the conversation store selected by CONVERSATION_STORE"""
+    if CONVERSATION_STORE == "sqlite":
+        return SQLiteConversationStore(
+            CONVERSATION_STORE_PATH,
+            CONVERSATION_MAX_ENTRIES,
+            CONVERSATION_TTL_SECONDS,
+            max_messages,
+        )
+    if CONVERSATION_STORE != "memory":
+        print(
+            f"Warning: Unknown CONVERSATION_STORE '{CONVERSATION_STORE}', "
+            "using in-memory store."
+        )
+    return InMemoryConversationStore(
+        CONVERSATION_MAX_ENTRIES, CONVERSATION_TTL_SECONDS, max_messages
+    )
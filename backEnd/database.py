@@ -9,6 +9,10 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     LargeBinary,
+    ForeignKey,
+    UniqueConstraint,
+    Index,
+    inspect,
 )
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
@@ -60,6 +64,8 @@ class About(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    # Keyset pagination orders by (created_at, id)
+    __table_args__ = (Index("ix_projects_created_at_id", "created_at", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     desc = Column(String(1000), nullable=False)
@@ -76,12 +82,28 @@ class Project(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    # Keyset pagination orders by (created_at, id) within is_archived and
+    # optionally is_read; date-range bulk actions use (created_at, id)
+    __table_args__ = (
+        Index("ix_messages_created_at_id", "created_at", "id"),
+        Index(
+            "ix_messages_is_archived_created_at_id", "is_archived", "created_at", "id"
+        ),
+        Index(
+            "ix_messages_is_archived_is_read_created_at_id",
+            "is_archived",
+            "is_read",
+            "created_at",
+            "id",
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     email = Column(String(255), nullable=False)
     subject = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
+    is_archived = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
 
@@ -100,8 +122,10 @@ class Document(Base):
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String(50), nullable=False, unique=True)
     filename = Column(String(255), nullable=False)
-    content = Column(LargeBinary, nullable=False)
     size = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=True)
+    # Content hash the stored DocumentText rows were extracted from
+    text_sha256 = Column(String(64), nullable=True)
     uploaded_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(
         DateTime,
@@ -110,6 +134,33 @@ class Document(Base):
     )
 
 
+class DocumentChunk(Base):
+    # PDF bytes are stored in fixed-size chunks so downloads can stream
+    # them with constant memory and serve byte ranges
+    __tablename__ = "document_chunks"
+    __table_args__ = (UniqueConstraint("document_id", "seq"),)
+    id = Column(Integer, primary_key=True)
+    document_id = Column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
+    seq = Column(Integer, nullable=False)
+    start_byte = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+
+
+class DocumentText(Base):
+    # Text extracted from a document's PDF at upload time, stored in
+    # paragraph-sized chunks for the chatbot's retrieval index
+    __tablename__ = "document_texts"
+    __table_args__ = (UniqueConstraint("document_id", "seq"),)
+    id = Column(Integer, primary_key=True)
+    document_id = Column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
+    seq = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -194,6 +245,20 @@ def create_tables():
         """
         )
         db.execute(create_projects_query)
+        db.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_projects_created_at_id "
+                "ON projects (created_at, id)"
+            )
+        )
+        if engine.dialect.name == "postgresql":
+            # Case-insensitive prefix filters (pagination.filter_prefix)
+            db.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_projects_lower_title "
+                    "ON projects (lower(title) text_pattern_ops)"
+                )
+            )
 
         create_skills_query = text(
             """
@@ -218,11 +283,77 @@ def create_tables():
             subject VARCHAR(255) NOT NULL,
             message TEXT NOT NULL,
             is_read BOOLEAN DEFAULT FALSE,
+            is_archived BOOLEAN DEFAULT FALSE NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         """
         )
         db.execute(create_messages_query)
+        db.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_messages_created_at_id "
+                "ON messages (created_at, id)"
+            )
+        )
+        # Databases created before is_archived get it from the migration;
+        # add it here too so the indexes below can be created either way
+        message_columns = {
+            column["name"] for column in inspect(db).get_columns("messages")
+        }
+        if "is_archived" not in message_columns:
+            db.execute(
+                text(
+                    "ALTER TABLE messages "
+                    "ADD COLUMN is_archived BOOLEAN DEFAULT FALSE NOT NULL"
+                )
+            )
+        db.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_messages_is_archived_created_at_id "
+                "ON messages (is_archived, created_at, id)"
+            )
+        )
+        db.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS "
+                "ix_messages_is_archived_is_read_created_at_id "
+                "ON messages (is_archived, is_read, created_at, id)"
+            )
+        )
+        # Weighted full-text vector for message search (see message_search.py)
+        # and the prefix filter indexes. Postgres only; other databases use
+        # the in-process fallback index and unindexed prefix scans.
+        if engine.dialect.name == "postgresql":
+            db.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_messages_lower_email "
+                    "ON messages (lower(email) text_pattern_ops)"
+                )
+            )
+            db.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_messages_lower_subject "
+                    "ON messages (lower(subject) text_pattern_ops)"
+                )
+            )
+            db.execute(
+                text(
+                    """
+        ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '') || ' ' || coalesce(email, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(subject, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(message, '')), 'C')
+        ) STORED;
+        """
+                )
+            )
+            db.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_messages_search_vector "
+                    "ON messages USING GIN (search_vector)"
+                )
+            )
 
         create_documents_query = text(
             """
@@ -230,8 +361,9 @@ def create_tables():
             id SERIAL PRIMARY KEY,
             type VARCHAR(50) NOT NULL UNIQUE,
             filename VARCHAR(255) NOT NULL,
-            content BYTEA NOT NULL,
             size INTEGER NOT NULL,
+            sha256 VARCHAR(64),
+            text_sha256 VARCHAR(64),
             uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
@@ -239,6 +371,33 @@ def create_tables():
         )
         db.execute(create_documents_query)
 
+        create_document_chunks_query = text(
+            """
+        CREATE TABLE IF NOT EXISTS document_chunks (
+            id SERIAL PRIMARY KEY,
+            document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL,
+            start_byte INTEGER NOT NULL,
+            data BYTEA NOT NULL,
+            UNIQUE (document_id, seq)
+        );
+        """
+        )
+        db.execute(create_document_chunks_query)
+
+        create_document_texts_query = text(
+            """
+        CREATE TABLE IF NOT EXISTS document_texts (
+            id SERIAL PRIMARY KEY,
+            document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            UNIQUE (document_id, seq)
+        );
+        """
+        )
+        db.execute(create_document_texts_query)
+
         db.commit()
 
         print("Users table ensured and admin inserted.")
@@ -0,0 +1,213 @@
+"""
+Document File Cache
+
+Keeps a local, content-addressed copy of each resume/CV so downloads can be
+served straight from disk with a FileResponse (sendfile / pathsend where the
+server supports it) and the database only answers a metadata lookup.
+
+Files are named after the sha256 of their content, so a re-upload with new
+content never collides with the old file. Each document also remembers the
+Document.updated_at its file was built from; when that changes, the entry is
+dropped and rebuilt. Total size on disk is bounded by
+DOCUMENT_CACHE_MAX_BYTES with least-recently-used eviction.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+DOCUMENT_CACHE_DIR = os.getenv("DOCUMENT_CACHE_DIR", "document_cache")
+DOCUMENT_CACHE_MAX_BYTES = int(
+    os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+CACHE_SUFFIX = ".pdf"
+
+
+class DocumentFileCache:
+    """Size-bounded LRU cache of document files keyed by content hash"""
+
+    def __init__(
+        self,
+        directory: str = DOCUMENT_CACHE_DIR,
+        max_bytes: int = DOCUMENT_CACHE_MAX_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # content hash -> file size, least recently used first
+        self._files = OrderedDict()
+        # document id -> (content hash, updated_at the file was built from)
+        self._documents = {}
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        """Adopt files left by a previous run, oldest first"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            paths = sorted(
+                self.directory.glob(f"*{CACHE_SUFFIX}"),
+                key=lambda path: path.stat().st_mtime,
+            )
+        except OSError as e:
+            print(f"Document cache unavailable: {str(e)}")
+            self.max_bytes = 0
+            return
+
+        for path in paths:
+            size = path.stat().st_size
+            self._files[path.stem] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _path(self, content_hash: str) -> Path:
+        return self.directory / f"{content_hash}{CACHE_SUFFIX}"
+
+    def _remove_file(self, content_hash: str):
+        size = self._files.pop(content_hash, None)
+        if size is None:
+            return
+        self._total_bytes -= size
+        try:
+            self._path(content_hash).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _release(self, document_id: int):
+        """Forget a document's file, deleting it unless another row uses it"""
+        entry = self._documents.pop(document_id, None)
+        if entry is None:
+            return
+        content_hash = entry[0]
+        if all(other[0] != content_hash for other in self._documents.values()):
+            self._remove_file(content_hash)
+
+    def _evict(self):
+        while self._files and self._total_bytes > self.max_bytes:
+            content_hash = next(iter(self._files))
+            self._remove_file(content_hash)
+            for document_id, entry in list(self._documents.items()):
+                if entry[0] == content_hash:
+                    del self._documents[document_id]
+            self.evictions += 1
+
+    def accepts(self, size: int) -> bool:
+        """Whether a file of this size can be cached at all"""
+        return 0 < size <= self.max_bytes
+
+    def lookup(
+        self, document_id: int, content_hash: Optional[str], updated_at: datetime
+    ) -> Optional[Path]:
+        """
+        Return the cached file for a document, or None on a miss.
+
+        A recorded entry whose updated_at no longer matches the row is
+        dropped. Files named after the row's content hash are valid whatever
+        their age, which lets a restarted worker reuse files already on disk.
+        """
+        with self._lock:
+            entry = self._documents.get(document_id)
+            if entry is not None and (
+                entry[1] != updated_at
+                or (content_hash is not None and entry[0] != content_hash)
+            ):
+                self._release(document_id)
+                entry = None
+
+            key = entry[0] if entry is not None else content_hash
+            if key is None or key not in self._files:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            if not path.is_file():
+                # Removed behind our back (another worker or a manual cleanup)
+                self._total_bytes -= self._files.pop(key)
+                self._documents.pop(document_id, None)
+                self.misses += 1
+                return None
+
+            self._documents[document_id] = (key, updated_at)
+            self._files.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def store(
+        self, document_id: int, updated_at: datetime, chunks: Iterable[bytes]
+    ) -> Optional[Path]:
+        """
+        Write a document's bytes to the cache and return the cached path.
+
+        The file is written under a temporary name, hashed on the way, then
+        renamed to its content hash so readers never see a partial file.
+        Returns None if the content is too large to cache or the write fails.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        except OSError as e:
+            print(f"Document cache write error: {str(e)}")
+            return None
+
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                for data in chunks:
+                    size += len(data)
+                    if size > self.max_bytes:
+                        raise ValueError("document is larger than the cache")
+                    digest.update(data)
+                    temp_file.write(data)
+            content_hash = digest.hexdigest()
+            path = self._path(content_hash)
+            os.replace(temp_name, path)
+        except (OSError, ValueError) as e:
+            print(f"Document cache write skipped: {str(e)}")
+            try:
+                os.unlink(temp_name)
+            except FileNotFoundError:
+                pass
+            return None
+
+        with self._lock:
+            entry = self._documents.get(document_id)
+            if entry is not None and entry[0] != content_hash:
+                self._release(document_id)
+            if content_hash in self._files:
+                self._total_bytes -= self._files[content_hash]
+            self._files[content_hash] = size
+            self._files.move_to_end(content_hash)
+            self._total_bytes += size
+            self._documents[document_id] = (content_hash, updated_at)
+            self._evict()
+            if content_hash not in self._files:
+                return None
+        return path
+
+    def discard(self, document_id: int):
+        """Drop a document's cached file, e.g. after it is deleted"""
+        with self._lock:
+            self._release(document_id)
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters"""
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "documents": len(self._documents),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,112 @@
+"""
+Chunked Document Storage
+
+This module stores resume/CV PDFs as rows of fixed-size chunks in the
+document_chunks table instead of one BYTEA value per document. Reads stream
+one chunk at a time from a server-side cursor, so serving a download holds a
+single chunk in memory regardless of file size or how many downloads run
+concurrently.
+"""
+
+import os
+from typing import Iterator, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, DocumentChunk
+
+DOCUMENT_CHUNK_SIZE = int(os.getenv("DOCUMENT_CHUNK_SIZE", str(256 * 1024)))
+
+
+class DocumentChunkWriter:
+    """
+    Writes a document's bytes as chunk rows while they arrive.
+
+    Incoming data of any size is regrouped into chunk_size rows, so at most
+    one chunk is buffered. Runs inside the caller's transaction and replaces
+    any chunks the document already had; the caller commits.
+    """
+
+    def __init__(
+        self, db: Session, document_id: int, chunk_size: int = DOCUMENT_CHUNK_SIZE
+    ):
+        self.db = db
+        self.document_id = document_id
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._seq = 0
+        self._buffer = bytearray()
+        delete_document_chunks(db, document_id)
+
+    def _insert(self, data: bytes):
+        self.db.execute(
+            insert(DocumentChunk).values(
+                document_id=self.document_id,
+                seq=self._seq,
+                start_byte=self.size,
+                data=data,
+            )
+        )
+        self._seq += 1
+        self.size += len(data)
+
+    def write(self, data: bytes):
+        """Append bytes, inserting every chunk that fills up"""
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            self._insert(bytes(self._buffer[: self.chunk_size]))
+            del self._buffer[: self.chunk_size]
+
+    def close(self) -> int:
+        """Flush the final partial chunk and return the total size"""
+        if self._buffer:
+            self._insert(bytes(self._buffer))
+            self._buffer.clear()
+        return self.size
+
+
+def delete_document_chunks(db: Session, document_id: int):
+    """Remove a document's chunks inside the caller's transaction"""
+    db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+
+
+def iter_document_chunks(
+    document_id: int, start: int = 0, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Yield a document's bytes chunk by chunk, optionally for a byte range.
+
+    Opens its own session so it can outlive the request's session when used
+    as a StreamingResponse body. Only the chunks overlapping the range are
+    read, one row at a time through a server-side cursor.
+
+    Args:
+        document_id: Document to read
+        start: First byte to return
+        end: Last byte to return, inclusive (default: end of file)
+    """
+    query = (
+        select(DocumentChunk.start_byte, DocumentChunk.data)
+        .where(DocumentChunk.document_id == document_id)
+        .order_by(DocumentChunk.seq)
+    )
+    if start > 0:
+        query = query.where(
+            DocumentChunk.start_byte + func.length(DocumentChunk.data) > start
+        )
+    if end is not None:
+        query = query.where(DocumentChunk.start_byte <= end)
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(query.execution_options(yield_per=1))
+        for chunk_start, data in rows:
+            lower = max(start - chunk_start, 0)
+            upper = len(data) if end is None else min(end - chunk_start + 1, len(data))
+            if lower == 0 and upper == len(data):
+                yield data
+            else:
+                yield data[lower:upper]
+    finally:
+        db.close()
@@ -0,0 +1,115 @@
+"""
+Document Text Extraction
+
+Extracts the text of an uploaded resume/CV once, at upload time, and stores
+it in paragraph-sized DocumentText rows. The chatbot reads those rows as
+ready-made context, so no PDF is ever parsed while answering a question.
+
+Extraction uses pypdf (pure Python), imported lazily so the rest of the app
+works without it; uploads then simply store no text. Each document records
+the content hash its text came from, and extraction is skipped when a
+re-upload has the same hash.
+"""
+
+import os
+import re
+from typing import BinaryIO, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from database import Document, DocumentText
+
+DOCUMENT_TEXT_CHUNK_CHARS = int(os.getenv("DOCUMENT_TEXT_CHUNK_CHARS", "1200"))
+# Guards against pathological PDFs; a resume is a few pages
+DOCUMENT_TEXT_MAX_PAGES = int(os.getenv("DOCUMENT_TEXT_MAX_PAGES", "20"))
+
+BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+def extract_pdf_text(stream: BinaryIO) -> Optional[str]:
+    """
+    Extract the text of a PDF, page by page.
+
+    Blocking and CPU-bound; call it from a worker thread.
+
+    Returns:
+        The extracted text, or None if the PDF can't be parsed or pypdf is
+        not installed, so the caller can retry extraction later
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        print("pypdf not installed; skipping document text extraction")
+        return None
+
+    try:
+        reader = PdfReader(stream)
+        pages = []
+        for page in reader.pages[:DOCUMENT_TEXT_MAX_PAGES]:
+            pages.append(page.extract_text() or "")
+    except Exception as e:
+        print(f"Document text extraction error: {str(e)}")
+        return None
+    return "\n\n".join(pages)
+
+
+def split_text(text: str, max_chars: int = DOCUMENT_TEXT_CHUNK_CHARS) -> list[str]:
+    """
+    Split text into chunks of whole paragraphs of up to max_chars.
+
+    Paragraphs longer than max_chars are split on line breaks, then hard
+    split as a last resort.
+    """
+    pieces = []
+    for paragraph in BLANK_LINES.split(text):
+        lines = [" ".join(line.split()) for line in paragraph.splitlines()]
+        paragraph = "\n".join(line for line in lines if line)
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.split("\n"):
+            for start in range(0, len(line), max_chars):
+                pieces.append(line[start : start + max_chars])
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def write_document_text(db: Session, document_id: int, chunks: list[str]):
+    """Replace a document's stored text inside the caller's transaction"""
+    delete_document_text(db, document_id)
+    for seq, content in enumerate(chunks):
+        db.execute(
+            insert(DocumentText).values(
+                document_id=document_id, seq=seq, content=content
+            )
+        )
+
+
+def delete_document_text(db: Session, document_id: int):
+    """Remove a document's stored text inside the caller's transaction"""
+    db.execute(delete(DocumentText).where(DocumentText.document_id == document_id))
+
+
+def load_document_texts(db: Session) -> dict[str, list[str]]:
+    """Return every document's stored text chunks, keyed by document type"""
+    rows = db.execute(
+        select(Document.type, DocumentText.content)
+        .join(DocumentText, DocumentText.document_id == Document.id)
+        .order_by(Document.type, DocumentText.seq)
+    )
+    texts = {}
+    for document_type, content in rows:
+        texts.setdefault(document_type, []).append(content)
+    return texts
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
 from database import get_db, Hero
+from portfolio_cache import invalidate_portfolio_context
+from read_cache import read_cache, serialize_rows
+from row_writes import update_row, delete_row
 from auth_utils import get_current_user
 
 router = APIRouter(prefix="/api/hero", tags=["Hero"])
@@ -35,9 +38,21 @@ class HeroResponse(HeroBase):
         from_attributes = True
 
 
+def load_heroes(db: Session) -> list:
+    """Serialized hero sections, shared by the read cache and static export"""
+    return serialize_rows(HeroResponse, db.query(Hero).all())
+
+
 @router.get("", response_model=List[HeroResponse])
-def get_all_heroes(db: Session = Depends(get_db)):
-    return db.query(Hero).all()
+def get_all_heroes(
+    db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)
+):
+    return read_cache.response(
+        "/api/hero",
+        ("hero",),
+        lambda: load_heroes(db),
+        if_none_match=if_none_match,
+    )
 
 
 @router.get("/{hero_id}", response_model=HeroResponse)
@@ -63,6 +78,7 @@ def create_hero(
     )
     db.add(new_hero)
     db.commit()
+    invalidate_portfolio_context("hero")
     db.refresh(new_hero)
     return new_hero
 
@@ -74,16 +90,14 @@ def update_hero(
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user),
 ):
-    db_hero = db.query(Hero).filter(Hero.id == hero_id).first()
-    if not db_hero:
-        raise HTTPException(status_code=404, detail=f"Hero with id {hero_id} not found")
-
-    update_data = hero.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_hero, key, value)
-
-    db.commit()
-    db.refresh(db_hero)
+    db_hero = update_row(
+        db,
+        Hero,
+        hero_id,
+        hero.model_dump(exclude_unset=True),
+        not_found=f"Hero with id {hero_id} not found",
+    )
+    invalidate_portfolio_context("hero")
     return db_hero
 
 
@@ -93,10 +107,6 @@ def delete_hero(
     db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user),
 ):
-    db_hero = db.query(Hero).filter(Hero.id == hero_id).first()
-    if not db_hero:
-        raise HTTPException(status_code=404, detail=f"Hero with id {hero_id} not found")
-
-    db.delete(db_hero)
-    db.commit()
+    delete_row(db, Hero, hero_id, not_found=f"Hero with id {hero_id} not found")
+    invalidate_portfolio_context("hero")
     return None
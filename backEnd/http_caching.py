@@ -0,0 +1,138 @@
+"""
+HTTP Caching Helpers
+
+Small helpers for conditional requests (ETag / Last-Modified validators and
+304 responses) and single byte-range requests (206 partial content), shared
+by routes that serve cacheable content.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+# Let clients and shared caches keep a copy but check it on every use
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP date; naive values are treated as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header, returning None if missing or malformed"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def weak_etag(data: bytes) -> str:
+    """Weak ETag derived from a response body"""
+    return f'W/"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match / If-Range header against an ETag.
+
+    Uses weak comparison, so W/"x" matches "x".
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == bare for candidate in header.split(",")
+    )
+
+
+def not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    Decide whether a GET can be answered with 304 Not Modified.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the client sent no ETag.
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    since = parse_http_date(if_modified_since)
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the resource"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a Range header into an inclusive (start, end) byte range.
+
+    Only single ranges are supported. Returns None when the header is absent,
+    malformed or asks for several ranges, in which case the full content
+    should be sent.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts beyond the end of the content
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes=") :].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    first, last = (part.strip() for part in spec.split("-", 1))
+    try:
+        if first == "":
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_allows(
+    header: Optional[str], etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """Check If-Range: a range may be served only if the validator still matches"""
+    if not header:
+        return True
+    if header.startswith('"') or header.startswith("W/"):
+        # Weak ETags must not be used with If-Range
+        return not header.startswith("W/") and etag_matches(header, etag)
+    since = parse_http_date(header)
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) == since
@@ -0,0 +1,67 @@
+"""
+LLM Provider Factory
+
+This module builds the chatbot's LLM client lazily, on first use, so workers
+that never serve a chat request don't pay for importing the provider SDK or
+constructing the client. Provider SDK imports happen inside the builder
+functions for the same reason.
+
+Select a provider with LLM_PROVIDER (currently only "groq").
+"""
+
+import os
+import threading
+import time
+
+from startup_timing import record_lazy_timing
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.3-70b-versatile")
+
+_lock = threading.Lock()
+_llm = None
+
+
+def build_groq_llm():
+    """Build a LangChain ChatGroq client"""
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(
+        model=LLM_MODEL,
+        temperature=0.7,
+        max_tokens=300,
+        api_key=os.getenv("GROQ_API_KEY"),
+    )
+
+
+LLM_PROVIDERS = {
+    "groq": build_groq_llm,
+}
+
+
+def current_llm():
+    """Return the LLM client if it has already been built, else None"""
+    return _llm
+
+
+def get_llm():
+    """
+    Return the shared LLM client, building it on first use.
+
+    This may import the provider SDK, so call it from a worker thread when
+    running inside the event loop.
+    """
+    global _llm
+    if _llm is not None:
+        return _llm
+
+    with _lock:
+        if _llm is None:
+            if LLM_PROVIDER not in LLM_PROVIDERS:
+                raise ValueError(f"Unknown LLM_PROVIDER '{LLM_PROVIDER}'")
+            start = time.perf_counter()
+            _llm = LLM_PROVIDERS[LLM_PROVIDER]()
+            record_lazy_timing(
+                f"llm_client_{LLM_PROVIDER}", (time.perf_counter() - start) * 1000
+            )
+    return _llm
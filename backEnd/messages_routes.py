@@ -1,8 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from pydantic import BaseModel, Field, EmailStr
+from sqlalchemy import Integer, any_, bindparam, delete, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
-from datetime import datetime
-from database import get_db, Message
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional, List
+from database import get_db, engine, Message
+from pagination import (
+    Page,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    filter_created,
+    filter_prefix,
+    keyset_page,
+)
+from message_search import search_messages, index_message, remove_message
+from row_writes import update_row, delete_row
 import os
 from dotenv import load_dotenv
 import resend
@@ -32,6 +45,7 @@ class MessageResponse(BaseModel):
     subject: str
     message: str
     is_read: bool
+    is_archived: bool = False
     created_at: datetime
 
     class Config:
@@ -46,6 +60,73 @@ class MessageUpdate(BaseModel):
     is_read: bool = Field(..., example=True)
 
 
+MAX_BULK_MESSAGE_IDS = 10000
+
+# Bulk action -> (values to set, condition matching rows it would change)
+BULK_MESSAGE_ACTIONS = {
+    "mark_read": ({"is_read": True}, Message.is_read.is_not(True)),
+    "mark_unread": ({"is_read": False}, Message.is_read == True),
+    "archive": ({"is_archived": True}, Message.is_archived == False),
+    "unarchive": ({"is_archived": False}, Message.is_archived == True),
+    "delete": (None, None),
+}
+
+
+class MessageFilter(BaseModel):
+    is_read: Optional[bool] = None
+    is_archived: Optional[bool] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    older_than_days: Optional[int] = Field(None, ge=0, example=30)
+    subject: Optional[str] = Field(None, description="Subject prefix")
+    email: Optional[str] = Field(None, description="Sender email prefix")
+
+
+class MessageBulkAction(BaseModel):
+    action: Literal["mark_read", "mark_unread", "archive", "unarchive", "delete"]
+    ids: Optional[List[int]] = Field(None, max_length=MAX_BULK_MESSAGE_IDS)
+    filter: Optional[MessageFilter] = None
+
+
+class MessageBulkResult(BaseModel):
+    action: str
+    affected: int
+
+
+def ids_match(ids: List[int]):
+    """id = ANY(:ids) with one array parameter on PostgreSQL, IN elsewhere"""
+    if engine.dialect.name == "postgresql":
+        return Message.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    return Message.id.in_(ids)
+
+
+def select_messages(statement, bulk: MessageBulkAction):
+    """Restrict an UPDATE/DELETE to the ids and/or filter of a bulk action"""
+    if bulk.ids is not None:
+        statement = statement.where(ids_match(bulk.ids))
+    conditions = bulk.filter
+    if conditions is not None:
+        if not conditions.model_dump(exclude_none=True):
+            raise HTTPException(
+                status_code=400, detail="Filter must set at least one condition"
+            )
+        if conditions.is_read is not None:
+            statement = statement.where(Message.is_read == conditions.is_read)
+        if conditions.is_archived is not None:
+            statement = statement.where(Message.is_archived == conditions.is_archived)
+        statement = filter_created(
+            statement, Message, conditions.since, conditions.until
+        )
+        if conditions.older_than_days is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(
+                days=conditions.older_than_days
+            )
+            statement = filter_created(statement, Message, None, cutoff)
+        statement = filter_prefix(statement, Message.subject, conditions.subject)
+        statement = filter_prefix(statement, Message.email, conditions.email)
+    return statement
+
+
 def send_email_notification(name: str, email: str, subject: str, message_content: str):
     """Send email notification to admin using Resend"""
     try:
@@ -99,13 +180,80 @@ def send_email_notification(name: str, email: str, subject: str, message_content
         print(f"Warning: Could not send email: {e}")
 
 
-@router.get("", response_model=list[MessageResponse])
+@router.get("", response_model=Page[MessageResponse])
 def get_all_messages(
-    db: Session = Depends(get_db), current_user: str = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    is_read: Optional[bool] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    subject: Optional[str] = Query(None, description="Subject prefix"),
+    email: Optional[str] = Query(None, description="Sender email prefix"),
+    archived: bool = False,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
 ):
-    """Get all messages (admin panel)"""
-    messages = db.query(Message).order_by(Message.created_at.desc()).all()
-    return messages
+    """
+    Get messages newest first, one page at a time (admin panel)
+    - Pass next_cursor from the previous page as cursor to continue
+    - Filters: is_read, since/until (created_at), subject and email prefixes
+    - Archived messages are listed only with archived=true
+    """
+    query = db.query(Message).filter(Message.is_archived == archived)
+    if is_read is not None:
+        query = query.filter(Message.is_read == is_read)
+    query = filter_created(query, Message, since, until)
+    query = filter_prefix(query, Message.subject, subject)
+    query = filter_prefix(query, Message.email, email)
+    return keyset_page(query, Message, cursor, limit)
+
+
+@router.get("/search", response_model=list[MessageResponse])
+def search_all_messages(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    archived: bool = False,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Full-text search over name, email, subject and message body
+    - Results are ranked, best match first
+    - Archived messages are searched only with archived=true
+    """
+    return search_messages(db, q, limit, archived)
+
+
+@router.post("/bulk", response_model=MessageBulkResult)
+def bulk_update_messages(
+    bulk: MessageBulkAction,
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Mark read/unread, archive/unarchive or delete many messages at once
+    - Select by ids, by filter (e.g. {"is_read": false, "older_than_days": 30}),
+      or both (rows must match both)
+    - Runs as a single UPDATE or DELETE and returns the number of rows changed
+    """
+    if bulk.ids is None and bulk.filter is None:
+        raise HTTPException(status_code=400, detail="Provide ids or a filter")
+
+    values, changes = BULK_MESSAGE_ACTIONS[bulk.action]
+    if values is None:
+        statement = select_messages(delete(Message), bulk).returning(Message.id)
+        deleted_ids = db.scalars(
+            statement, execution_options={"synchronize_session": False}
+        ).all()
+        db.commit()
+        remove_message(*deleted_ids)
+        return {"action": bulk.action, "affected": len(deleted_ids)}
+
+    # Rows already in the target state are left untouched
+    statement = select_messages(update(Message).where(changes).values(values), bulk)
+    result = db.execute(statement, execution_options={"synchronize_session": False})
+    db.commit()
+    return {"action": bulk.action, "affected": result.rowcount}
 
 
 @router.get("/{message_id}", response_model=MessageResponse)
@@ -130,6 +278,7 @@ def create_message(msg: MessageCreate, db: Session = Depends(get_db)):
     db.add(db_message)
     db.commit()
     db.refresh(db_message)
+    index_message(db_message)
 
     # Send email notification to admin
     send_email_notification(msg.name, msg.email, msg.subject, msg.message)
@@ -145,14 +294,13 @@ def update_message(
     current_user: str = Depends(get_current_user),
 ):
     """Mark message as read/unread"""
-    db_message = db.query(Message).filter(Message.id == message_id).first()
-    if not db_message:
-        raise HTTPException(status_code=404, detail="Message not found")
-
-    db_message.is_read = msg_update.is_read
-    db.commit()
-    db.refresh(db_message)
-    return db_message
+    return update_row(
+        db,
+        Message,
+        message_id,
+        {"is_read": msg_update.is_read},
+        not_found="Message not found",
+    )
 
 
 @router.delete("/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -162,12 +310,8 @@ def delete_message(
     current_user: str = Depends(get_current_user),
 ):
     """Delete a message"""
-    db_message = db.query(Message).filter(Message.id == message_id).first()
-    if not db_message:
-        raise HTTPException(status_code=404, detail="Message not found")
-
-    db.delete(db_message)
-    db.commit()
+    delete_row(db, Message, message_id, not_found="Message not found")
+    remove_message(message_id)
 
 
 class ReplyCreate(BaseModel):
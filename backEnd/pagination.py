@@ -0,0 +1,112 @@
+"""
+Keyset Pagination
+
+Helpers for paging admin listings newest-first on (created_at, id). Each
+page continues from an opaque cursor holding the last row's key instead of
+an OFFSET, so with a composite (created_at, id) index every page costs the
+same however deep the listing goes.
+"""
+
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Generic, Optional, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the row a page ended on"""
+    data = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor from encode_cursor(), raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def as_utc_naive(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; convert aware filter values to match"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def filter_created(
+    query: Query, model, since: Optional[datetime], until: Optional[datetime]
+) -> Query:
+    """Keep rows created in [since, until)"""
+    if since is not None:
+        query = query.filter(model.created_at >= as_utc_naive(since))
+    if until is not None:
+        query = query.filter(model.created_at < as_utc_naive(until))
+    return query
+
+
+def like_prefix(prefix: str) -> str:
+    """LIKE pattern matching values that start with prefix (escape: \\)"""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def filter_prefix(query: Query, column, prefix: Optional[str]) -> Query:
+    """
+    Keep rows whose column starts with prefix, ignoring case.
+
+    The pattern is one constant, so on Postgres the lower(column)
+    text_pattern_ops indexes from create_tables() serve the match.
+    """
+    if not prefix:
+        return query
+    return query.filter(
+        func.lower(column).like(like_prefix(prefix.lower()), escape="\\")
+    )
+
+
+def keyset_page(query: Query, model, cursor: Optional[str], limit: int) -> dict:
+    """
+    Return one newest-first page of a query.
+
+    Args:
+        query: Filtered query over model
+        model: Mapped class with created_at and id columns
+        cursor: next_cursor from the previous page, if any
+        limit: Page size
+
+    Returns:
+        {"items": rows, "next_cursor": cursor or None on the last page}
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+        )
+
+    # One extra row tells us whether another page exists
+    rows = (
+        query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
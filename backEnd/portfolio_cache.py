@@ -0,0 +1,142 @@
+"""
+Portfolio Context Cache
+
+This module keeps a versioned, in-process snapshot of the portfolio data the
+chatbot grounds its answers on. The snapshot is rebuilt only when an admin
+write route calls invalidate_portfolio_context() or when the TTL expires, so
+bursts of chat messages reuse the same context without touching the database.
+
+Writes are tracked per table, so a snapshot builder can refresh just the
+tables that changed instead of reloading everything. The same per-table
+versions drive the public read cache in read_cache.py.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+PORTFOLIO_CONTEXT_TTL_SECONDS = int(os.getenv("PORTFOLIO_CONTEXT_TTL_SECONDS", "300"))
+
+_lock = threading.Lock()
+# Held while rebuilding the snapshot so concurrent readers don't each rebuild
+_refill_lock = threading.Lock()
+_version = 0
+_table_versions: dict[str, int] = {}
+_full_rebuild_version = 0
+_snapshot: Any = None
+_snapshot_version = -1
+_snapshot_built_at = 0.0
+_listeners: list[Callable[[Optional[str]], None]] = []
+
+
+def get_table_versions(tables: tuple[str, ...]) -> tuple[int, ...]:
+    """
+    Return the version at which each table last changed.
+
+    A table-less invalidation counts as a change to every table.
+    """
+    with _lock:
+        return tuple(
+            max(_table_versions.get(table, 0), _full_rebuild_version)
+            for table in tables
+        )
+
+
+def add_invalidation_listener(listener: Callable[[Optional[str]], None]):
+    """
+    Register a callback run after every invalidate_portfolio_context().
+
+    The callback receives the table name (None for all tables) and runs on
+    the writing request's thread, so it must return quickly.
+    """
+    _listeners.append(listener)
+
+
+def invalidate_portfolio_context(table: Optional[str] = None) -> int:
+    """
+    Mark the cached portfolio snapshot as stale.
+
+    Call this after committing any change to projects, skills, about, hero
+    or documents. The next reader rebuilds the snapshot.
+
+    Args:
+        table: Name of the table that changed (default: all tables)
+
+    Returns:
+        The new context version
+    """
+    global _version, _full_rebuild_version
+    with _lock:
+        _version += 1
+        if table is None:
+            _full_rebuild_version = _version
+        else:
+            _table_versions[table] = _version
+        version = _version
+
+    for listener in _listeners:
+        listener(table)
+    return version
+
+
+def _is_expired() -> bool:
+    return time.monotonic() - _snapshot_built_at >= PORTFOLIO_CONTEXT_TTL_SECONDS
+
+
+def _is_fresh() -> bool:
+    """Whether the snapshot is current; call with _lock held"""
+    return _snapshot is not None and _snapshot_version == _version and not _is_expired()
+
+
+def get_portfolio_snapshot(
+    build: Callable[[Any, Optional[set[str]]], Any]
+) -> tuple[Any, int]:
+    """
+    Return the cached portfolio snapshot, rebuilding it if stale.
+
+    The snapshot is stale when the version has been bumped since it was built
+    or when it is older than PORTFOLIO_CONTEXT_TTL_SECONDS. The TTL covers
+    writes made by other workers or directly in the database. Only one
+    caller rebuilds at a time; concurrent callers wait for its snapshot.
+
+    Args:
+        build: Callable taking (previous snapshot, stale tables) and returning
+            a fresh snapshot. Stale tables is None when everything must be
+            reloaded (first build, TTL expiry or a table-less invalidation).
+
+    Returns:
+        Tuple of (snapshot, version it was built for)
+    """
+    global _snapshot, _snapshot_version, _snapshot_built_at
+    with _lock:
+        if _is_fresh():
+            return _snapshot, _snapshot_version
+
+    # Only one caller rebuilds; the others wait and reuse its snapshot
+    with _refill_lock:
+        with _lock:
+            if _is_fresh():
+                return _snapshot, _snapshot_version
+
+            # Capture the version before building so a write that lands
+            # mid-build leaves the new snapshot stale instead of hiding it.
+            version = _version
+            previous = _snapshot
+            expired = _is_expired()
+            if previous is None or expired or _full_rebuild_version > _snapshot_version:
+                stale_tables = None
+            else:
+                stale_tables = {
+                    table
+                    for table, table_version in _table_versions.items()
+                    if table_version > _snapshot_version
+                }
+
+        snapshot = build(previous, stale_tables)
+
+        with _lock:
+            _snapshot = snapshot
+            _snapshot_version = version
+            _snapshot_built_at = time.monotonic()
+        return snapshot, version
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import datetime
+from database import get_db, Skill, Document
+from hero_routes import HeroResponse, load_heroes
+from about_routes import AboutResponse, load_about
+from projects_routes import ProjectResponse, load_projects
+from skills_routes import SkillResponse
+from read_cache import read_cache, serialize_rows
+
+router = APIRouter(prefix="/api/portfolio", tags=["Portfolio"])
+
+# Tables the bundle is built from; a write to any of them refreshes it
+PORTFOLIO_TABLES = ("hero", "about", "projects", "skills", "documents")
+
+
+class DocumentInfo(BaseModel):
+    filename: str
+    size: int
+    updated_at: Optional[datetime] = None
+
+
+class PortfolioResponse(BaseModel):
+    hero: List[HeroResponse]
+    about: List[AboutResponse]
+    projects: List[ProjectResponse]
+    skills: Dict[str, List[SkillResponse]]
+    documents: Dict[str, Optional[DocumentInfo]]
+
+
+def build_portfolio(db: Session) -> dict:
+    """Assemble the home page bundle, one query per table on one connection"""
+    skills = {}
+    for skill in serialize_rows(
+        SkillResponse, db.query(Skill).order_by(Skill.id).all()
+    ):
+        skills.setdefault(skill["category"] or "Other", []).append(skill)
+
+    documents = {"resume": None, "cv": None}
+    for doc_type, filename, size, updated_at in db.query(
+        Document.type, Document.filename, Document.size, Document.updated_at
+    ).filter(Document.type.in_(documents.keys())):
+        documents[doc_type] = DocumentInfo(
+            filename=filename, size=size, updated_at=updated_at
+        ).model_dump(mode="json")
+
+    return {
+        "hero": load_heroes(db),
+        "about": load_about(db),
+        "projects": load_projects(db),
+        "skills": skills,
+        "documents": documents,
+    }
+
+
+@router.get("", response_model=PortfolioResponse)
+def get_portfolio(
+    db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)
+):
+    """
+    Everything the public home page needs in one response
+    - Hero, about and projects as returned by their own endpoints
+    - Skills grouped by category
+    - Resume/CV metadata
+    """
+    return read_cache.response(
+        "/api/portfolio",
+        PORTFOLIO_TABLES,
+        lambda: build_portfolio(db),
+        if_none_match=if_none_match,
+    )
@@ -1,9 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status, Header
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional
 from database import get_db, Project
+from portfolio_cache import invalidate_portfolio_context
+from read_cache import read_cache, serialize_rows
+from bulk_ops import BulkRequest, BulkResponse, apply_bulk
+from row_writes import update_row, delete_row
+from pagination import (
+    Page,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    filter_created,
+    filter_prefix,
+    keyset_page,
+)
 from auth_utils import get_current_user
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
@@ -53,21 +65,61 @@ class ProjectResponse(BaseModel):
         from_attributes = True
 
 
+def load_projects(db: Session) -> list:
+    """Serialized projects, newest first, shared by the read cache and static export"""
+    return serialize_rows(
+        ProjectResponse, db.query(Project).order_by(Project.created_at.desc()).all()
+    )
+
+
 # Routes
 
 
 @router.get("", response_model=list[ProjectResponse])
-def get_all_projects(db: Session = Depends(get_db)):
-    """Get all projects for the public Projects page"""
-    projects = db.query(Project).order_by(Project.created_at.desc()).all()
-    return projects
+def get_all_projects(
+    db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)
+):
+    """Get all projects for the public Projects page (served from the read cache)"""
+    return read_cache.response(
+        "/api/projects",
+        ("projects",),
+        lambda: load_projects(db),
+        if_none_match=if_none_match,
+    )
 
 
-@router.get("/manage", response_model=list[ProjectResponse])
-def get_projects_for_manage(db: Session = Depends(get_db)):
-    """Get all projects for the ManageProjects admin page"""
-    projects = db.query(Project).order_by(Project.created_at.desc()).all()
-    return projects
+@router.get("/manage", response_model=Page[ProjectResponse])
+def get_projects_for_manage(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    title: Optional[str] = Query(None, description="Title prefix"),
+    db: Session = Depends(get_db),
+):
+    """
+    Get projects newest first, one page at a time (admin page)
+    - Pass next_cursor from the previous page as cursor to continue
+    - Filters: since/until (created_at) and title prefix
+    """
+    query = filter_created(db.query(Project), Project, since, until)
+    query = filter_prefix(query, Project.title, title)
+    return keyset_page(query, Project, cursor, limit)
+
+
+@router.post("/bulk", response_model=BulkResponse[ProjectResponse])
+def bulk_projects(
+    request: BulkRequest[ProjectUpdate],
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Create, update and delete projects in one transaction
+    - Each operation: {"op": "create" | "update" | "delete", "id": ..., "data": {...}}
+    - All or nothing: any invalid operation rejects the whole request with
+      per-item errors
+    """
+    return apply_bulk(db, Project, request, ProjectCreate, ProjectResponse)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -95,6 +147,7 @@ def create_project(
     )
     db.add(db_project)
     db.commit()
+    invalidate_portfolio_context("projects")
     db.refresh(db_project)
     return db_project
 
@@ -107,23 +160,15 @@ def update_project(
     current_user: str = Depends(get_current_user),
 ):
     """Update an existing project"""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
-    if not db_project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    if project.title is not None:
-        db_project.title = project.title
-    if project.desc is not None:
-        db_project.desc = project.desc
-    if project.github is not None:
-        db_project.github = project.github
-    if project.demo is not None:
-        db_project.demo = project.demo
-    if project.image_url is not None:
-        db_project.image_url = project.image_url
-
-    db.commit()
-    db.refresh(db_project)
+    # Fields left as None keep their current value
+    db_project = update_row(
+        db,
+        Project,
+        project_id,
+        project.model_dump(exclude_none=True),
+        not_found="Project not found",
+    )
+    invalidate_portfolio_context("projects")
     return db_project
 
 
@@ -134,9 +179,5 @@ def delete_project(
     current_user: str = Depends(get_current_user),
 ):
     """Delete a project"""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
-    if not db_project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    db.delete(db_project)
-    db.commit()
+    delete_row(db, Project, project_id, not_found="Project not found")
+    invalidate_portfolio_context("projects")
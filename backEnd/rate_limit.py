@@ -0,0 +1,237 @@
+"""
+Rate Limiting Middleware
+
+This module rate limits public endpoints per client IP using token buckets.
+Each bucket is two numbers (tokens left, last refill time), so checking a
+request is constant time and memory per key no matter how busy the client is.
+Idle buckets are swept periodically so IPs that stop calling are forgotten.
+
+Limits are configured per route group as "<requests>/<seconds>", e.g.
+RATE_LIMIT_CHATBOT=10/60 allows bursts of 10 and refills 10 every minute.
+
+Range requests to resume downloads aren't counted: PDF viewers and
+download managers fetch one document in many ranges and would hit the limit
+on a shared link. The tradeoff is that a client sending Range headers can
+download without limit; the full-file GET that normally starts a viewer's
+session still counts.
+
+Set RATE_LIMIT_BACKEND=sqlite to keep buckets in a SQLite file shared by all
+uvicorn workers on the host, so limits hold across processes.
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_STORE_PATH = os.getenv("RATE_LIMIT_STORE_PATH", "rate_limits.db")
+RATE_LIMIT_SWEEP_SECONDS = int(os.getenv("RATE_LIMIT_SWEEP_SECONDS", "60"))
+
+# (group, method, path, match prefix?, default limit)
+ROUTE_GROUPS = [
+    ("chatbot", "POST", "/api/chatbot/", True, "10/60"),
+    ("contact", "POST", "/api/messages", False, "5/300"),
+    ("login", "POST", "/login", False, "5/60"),
+    ("resume", "GET", "/api/resume/download/", True, "30/60"),
+]
+
+# Groups whose requests carrying a Range header are not counted
+RANGE_EXEMPT_GROUPS = {"resume"}
+
+
+def parse_limit(value: str) -> tuple[int, float]:
+    """Parse "<requests>/<seconds>" into (capacity, refill rate per second)"""
+    requests, seconds = value.split("/")
+    capacity = int(requests)
+    return capacity, capacity / float(seconds)
+
+
+class TokenBucketLimiter:
+    """In-process token buckets keyed by an arbitrary string"""
+
+    blocking = False
+
+    def __init__(self, sweep_interval: int = RATE_LIMIT_SWEEP_SECONDS):
+        self._lock = threading.Lock()
+        self._buckets = {}  # key -> (tokens, last_refill)
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+    def _sweep(self, now: float):
+        # A bucket idle long enough to refill completely carries no state
+        stale = [
+            key
+            for key, (_, last, full_after) in self._buckets.items()
+            if now - last >= full_after
+        ]
+        for key in stale:
+            del self._buckets[key]
+        self._last_sweep = now
+
+    def hit(self, key: str, capacity: int, rate: float) -> float:
+        """
+        Take one token from the bucket for key.
+
+        Returns:
+            0 if the request is allowed, otherwise seconds until a token frees up
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self._sweep_interval:
+                self._sweep(now)
+
+            tokens, last, _ = self._buckets.get(key, (capacity, now, 0))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now, capacity / rate)
+                return (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1, now, capacity / rate)
+            return 0
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteTokenBucketLimiter:
+    """Token buckets stored in a SQLite file shared between worker processes"""
+
+    blocking = True
+
+    def __init__(self, path: str, sweep_interval: int = RATE_LIMIT_SWEEP_SECONDS):
+        self.path = path
+        self._local = threading.local()
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, capacity: int, rate: float) -> float:
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if now - self._last_sweep >= self._sweep_interval:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+                self._last_sweep = now
+
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, last = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                """
+                INSERT INTO rate_limits (key, tokens, updated_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    updated_at = excluded.updated_at,
+                    expires_at = excluded.expires_at
+                """,
+                (key, tokens, now, now + capacity / rate),
+            )
+        return 0 if allowed else (1 - tokens) / rate
+
+
+def create_limiter():
+    """Build the limiter backend selected by RATE_LIMIT_BACKEND"""
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteTokenBucketLimiter(RATE_LIMIT_STORE_PATH)
+    if RATE_LIMIT_BACKEND != "memory":
+        print(
+            f"Warning: Unknown RATE_LIMIT_BACKEND '{RATE_LIMIT_BACKEND}', "
+            "using in-memory limiter."
+        )
+    return TokenBucketLimiter()
+
+
+def load_route_limits() -> list:
+    """Resolve each route group's limit, allowing RATE_LIMIT_<GROUP> overrides"""
+    limits = []
+    for group, method, path, prefix, default in ROUTE_GROUPS:
+        value = os.getenv(f"RATE_LIMIT_{group.upper()}", default)
+        capacity, rate = parse_limit(value)
+        limits.append((group, method, path, prefix, capacity, rate))
+    return limits
+
+
+class RateLimitMiddleware:
+    """ASGI middleware that applies the per-group token bucket limits"""
+
+    def __init__(self, app, limiter=None, route_limits: list | None = None):
+        self.app = app
+        self.limiter = limiter or create_limiter()
+        self.route_limits = route_limits or load_route_limits()
+
+    def _match(self, method: str, path: str):
+        for route in self.route_limits:
+            group, group_method, group_path, prefix, capacity, rate = route
+            if method != group_method:
+                continue
+            if path == group_path or (prefix and path.startswith(group_path)):
+                return group, capacity, rate
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        match = self._match(scope["method"], scope["path"])
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+
+        group, capacity, rate = match
+        if group in RANGE_EXEMPT_GROUPS and any(
+            name == b"range" for name, _ in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = f"{group}:{client[0] if client else 'unknown'}"
+
+        if self.limiter.blocking:
+            retry_after = await run_in_threadpool(self.limiter.hit, key, capacity, rate)
+        else:
+            retry_after = self.limiter.hit(key, capacity, rate)
+
+        if retry_after:
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "detail": "Too many requests. Please wait a moment before trying again."
+                },
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
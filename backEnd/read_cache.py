@@ -0,0 +1,168 @@
+"""
+Public Read Cache
+
+This module caches the serialized responses of the public content endpoints
+(hero, about, projects, skills) so page views are served from memory instead
+of querying Postgres and validating every row through Pydantic.
+
+Each entry records the portfolio_cache table versions it was built from.
+Write routes already call invalidate_portfolio_context(table) after every
+commit, which bumps that table's version, so only the affected entries are
+refilled. A TTL covers writes made by other workers.
+
+Refills are single-flight: when an entry goes stale under load, one request
+rebuilds it while concurrent requests for the same key wait for the result
+instead of all hitting the database at once.
+
+Entries hold the final JSON bytes, encoded once per refill (with orjson when
+it is installed), so a hit does no validation or encoding at all; it just
+wraps the bytes in a response. Every entry also carries a weak ETag, so a
+client revalidating with If-None-Match gets a 304 without the database being
+touched while the entry is fresh.
+
+benchmark_read_cache.py measures the per-request cost with and without the
+cache.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from http_caching import REVALIDATE_CACHE_CONTROL, etag_matches, weak_etag
+from portfolio_cache import get_table_versions
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+READ_CACHE_TTL_SECONDS = int(os.getenv("READ_CACHE_TTL_SECONDS", "60"))
+
+
+def serialize_rows(model: type[BaseModel], rows) -> list:
+    """Validate ORM rows through a response model into JSON-ready dicts"""
+    return [model.model_validate(row).model_dump(mode="json") for row in rows]
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode JSON-ready content compactly, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode_with_etag(content: Any) -> tuple[bytes, str]:
+    """Encode content once and pair the bytes with their weak ETag"""
+    body = encode_json(content)
+    return body, weak_etag(body)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that sends pre-encoded bytes as-is and encodes with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return encode_json(content)
+
+
+class ReadCache:
+    """Version-checked cache of serialized responses with single-flight refills"""
+
+    def __init__(self, ttl_seconds: int = READ_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (value, table versions, built_at)
+        self._entries = {}
+        # key -> lock held while that key is being refilled
+        self._refill_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+
+    def _fresh(self, key: str, versions: tuple[int, ...]):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] != versions:
+            return None
+        if time.monotonic() - entry[2] >= self.ttl_seconds:
+            return None
+        return entry
+
+    def get_or_load(
+        self, key: str, tables: tuple[str, ...], load: Callable[[], Any]
+    ) -> Any:
+        """
+        Return the cached value for key, calling load() to rebuild it if stale.
+
+        Args:
+            key: Cache key, usually the endpoint path
+            tables: Tables the value is built from
+            load: Builds the value; called by at most one thread per key
+        """
+        with self._lock:
+            entry = self._fresh(key, get_table_versions(tables))
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            refill_lock = self._refill_locks.setdefault(key, threading.Lock())
+
+        with refill_lock:
+            # Another request may have refilled it while we waited
+            versions = get_table_versions(tables)
+            with self._lock:
+                entry = self._fresh(key, versions)
+            if entry is not None:
+                return entry[0]
+
+            # Versions are captured before loading so a write that lands
+            # mid-load leaves the new entry stale instead of hiding the change
+            value = load()
+            with self._lock:
+                self._entries[key] = (value, versions, time.monotonic())
+                self.refills += 1
+            return value
+
+    def response(
+        self,
+        key: str,
+        tables: tuple[str, ...],
+        load: Callable[[], Any],
+        if_none_match: Optional[str] = None,
+    ) -> Response:
+        """
+        Serve a cached value as pre-encoded JSON, bypassing response_model
+        validation and encoding.
+
+        Returns 304 Not Modified when If-None-Match matches the entry's ETag.
+        """
+        body, etag = self.get_or_load(key, tables, lambda: encode_with_etag(load()))
+        headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return FastJSONResponse(content=body, headers=headers)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refills": self.refills,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+# Shared by the public content routers
+read_cache = ReadCache()
@@ -0,0 +1,207 @@
+"""
+Chatbot Response Cache
+
+This module caches chatbot replies to first-turn questions so the handful of
+questions most visitors ask ("what's your stack?", "are you available?")
+don't each cost a Groq call.
+
+Entries are keyed by the normalized question and the portfolio context
+version, so any admin edit invalidates every cached reply. Near-duplicate
+questions ("Which projects use React?" vs "which project uses react") match
+when they ask about the same content terms, as produced by the retrieval
+index's tokenizer, and their hashed character trigrams are similar. Terms
+may differ only by single-character typos, so "...with Python and FastAPI?"
+never reuses the answer to "...with Go and FastAPI?".
+"""
+
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from retrieval_index import tokenize
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+# Trigram floor for near hits; the content-term check is what keeps
+# different questions apart, so this only has to reject rewordings
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.6"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+
+NGRAM_SIZE = 3
+# Shortest term a one-character typo is tolerated in
+TYPO_MIN_LENGTH = 4
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    question = question.lower().replace("'", "")
+    question = re.sub(r"[^\w\s+#]", " ", question)
+    return " ".join(question.split())
+
+
+def question_shingles(normalized: str) -> frozenset[int]:
+    """Hash the character n-grams of a normalized question"""
+    padded = f" {normalized} "
+    if len(padded) <= NGRAM_SIZE:
+        return frozenset({zlib.crc32(padded.encode())})
+    return frozenset(
+        zlib.crc32(padded[i : i + NGRAM_SIZE].encode())
+        for i in range(len(padded) - NGRAM_SIZE + 1)
+    )
+
+
+def question_terms(normalized: str) -> frozenset[str]:
+    """Content terms of a question, stopwords removed"""
+    return frozenset(tokenize(normalized))
+
+
+def is_typo(a: str, b: str) -> bool:
+    """True if two words differ by one inserted, deleted, replaced or swapped letter"""
+    if min(len(a), len(b)) < TYPO_MIN_LENGTH or abs(len(a) - len(b)) > 1:
+        return False
+    if any(c.isdigit() for c in a + b):
+        return False  # 2023 vs 2024 is a different question
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1 :]
+    swapped = a[i + 1 : i + 2] == b[i : i + 1] and a[i : i + 1] == b[i + 1 : i + 2]
+    return a[i + 1 :] == b[i + 1 :] or (swapped and a[i + 2 :] == b[i + 2 :])
+
+
+def terms_match(a: frozenset[str], b: frozenset[str]) -> bool:
+    """True if two term sets are equal up to one-letter typos"""
+    if a == b:
+        return True
+    only_a, only_b = sorted(a - b), sorted(b - a)
+    if len(only_a) != len(only_b):
+        return False
+    for term in only_a:
+        partner = next((other for other in only_b if is_typo(term, other)), None)
+        if partner is None:
+            return False
+        only_b.remove(partner)
+    return True
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two shingle sets"""
+    if not a or not b:
+        return 0.0
+    intersection = len(a & b)
+    return intersection / (len(a) + len(b) - intersection)
+
+
+class ResponseCache:
+    """LRU cache of chatbot replies for a single context version"""
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        similarity: float = RESPONSE_CACHE_SIMILARITY,
+        ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # normalized question -> (shingles, terms, response, created_at)
+        self._entries = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: int):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def _find(self, key: str, shingles: frozenset, terms: frozenset):
+        entry = self._entries.get(key)
+        if entry is not None:
+            return key, entry, True
+
+        best_key, best_entry, best_score = None, None, self.similarity
+        for other_key, other in self._entries.items():
+            other_shingles, other_terms = other[0], other[1]
+            # Jaccard can't exceed the ratio of the two set sizes
+            smaller, larger = sorted((len(shingles), len(other_shingles)))
+            if smaller < best_score * larger:
+                continue
+            # Similar wording isn't enough; the question must be about the
+            # same things
+            if not terms_match(terms, other_terms):
+                continue
+            score = jaccard(shingles, other_shingles)
+            if score >= best_score:
+                best_key, best_entry, best_score = other_key, other, score
+        return best_key, best_entry, False
+
+    def get(self, question: str, version: int) -> str | None:
+        """Return a cached reply for the question, or None on a miss"""
+        key = normalize_question(question)
+        shingles = question_shingles(key)
+        terms = question_terms(key)
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and version < self._version:
+                self.misses += 1
+                return None
+            self._check_version(version)
+            found_key, entry, exact = self._find(key, shingles, terms)
+            if entry is None or now - entry[3] >= self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[found_key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(found_key)
+            if exact:
+                self.hits += 1
+            else:
+                self.near_hits += 1
+            return entry[2]
+
+    def put(self, question: str, version: int, response: str):
+        """Cache a reply produced for the given context version"""
+        key = normalize_question(question)
+        with self._lock:
+            # Only cache replies built from the newest context seen
+            if self._version is not None and version < self._version:
+                return
+            self._check_version(version)
+            self._entries[key] = (
+                question_shingles(key),
+                question_terms(key),
+                response,
+                time.monotonic(),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "context_version": self._version,
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0
+                ),
+                "invalidations": self.invalidations,
+            }
@@ -1,10 +1,36 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends
-from fastapi.responses import StreamingResponse
-import io
+from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, Header
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from functools import partial
 from pathlib import Path
+from typing import Optional
+import hashlib
 import re
 from auth_utils import get_current_user
 from database import get_db, Document
+from document_cache import DocumentFileCache
+from document_text import (
+    extract_pdf_text,
+    split_text,
+    write_document_text,
+    delete_document_text,
+)
+from document_storage import (
+    DocumentChunkWriter,
+    DOCUMENT_CHUNK_SIZE,
+    delete_document_chunks,
+    iter_document_chunks,
+)
+from http_caching import (
+    REVALIDATE_CACHE_CONTROL,
+    http_date,
+    not_modified,
+    parse_range,
+    if_range_allows,
+    RangeNotSatisfiable,
+)
+from portfolio_cache import invalidate_portfolio_context
+from read_cache import read_cache
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
@@ -14,6 +40,12 @@ router = APIRouter()
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {".pdf"}
 PDF_MAGIC_NUMBER = b"%PDF"
+UPLOAD_READ_SIZE = DOCUMENT_CHUNK_SIZE
+# Room for the multipart boundaries and the "type" form field
+MAX_UPLOAD_BODY_SIZE = MAX_FILE_SIZE + 64 * 1024
+
+# Local copies of the PDFs so downloads skip the database
+document_cache = DocumentFileCache()
 
 
 def sanitize_filename(filename: str) -> str:
@@ -28,6 +60,59 @@ def validate_pdf_content(file_content: bytes) -> bool:
     return file_content.startswith(PDF_MAGIC_NUMBER)
 
 
+def store_upload(db: Session, type: str, filename: str, upload) -> tuple:
+    """
+    Store a spooled upload as the resume/CV document and commit.
+
+    Reads the upload in chunks, checking size and hashing as it goes, and
+    extracts the PDF text when the content changed.
+
+    Returns:
+        Tuple of (document id, updated_at, size in bytes), read after the
+        commit so the caller doesn't reload the expired row on the event loop
+    """
+    document = db.query(Document).filter(Document.type == type).first()
+    existing = document is not None
+    if not existing:
+        document = Document(type=type, filename=filename, size=0)
+        db.add(document)
+
+    # Flush to get the document id, then copy the upload into its chunks
+    db.flush()
+    writer = DocumentChunkWriter(db, document.id)
+    digest = hashlib.sha256()
+    size = 0
+    for data in iter(partial(upload.read, UPLOAD_READ_SIZE), b""):
+        size += len(data)
+        # Validate file size as bytes are copied
+        if size > MAX_FILE_SIZE:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE / 1024 / 1024}MB",
+            )
+        digest.update(data)
+        writer.write(data)
+    writer.close()
+
+    document.filename = filename
+    document.size = size
+    document.sha256 = digest.hexdigest()
+    if existing:
+        document.updated_at = datetime.now(timezone.utc)
+
+    # Extract the text for the chatbot once per distinct content; a failed
+    # extraction leaves text_sha256 unset so the next upload retries it
+    if document.text_sha256 != document.sha256:
+        upload.seek(0)
+        text = extract_pdf_text(upload)
+        write_document_text(db, document.id, split_text(text or ""))
+        document.text_sha256 = document.sha256 if text is not None else None
+
+    db.commit()
+    return document.id, document.updated_at, size
+
+
 @router.post("/api/resume/upload")
 async def upload_document(
     file: UploadFile = File(...),
@@ -41,7 +126,9 @@ async def upload_document(
     - Only accepts PDF files
     - Maximum file size: 10MB
     - Validates file content
-    - Stores in PostgreSQL database
+    - Reads the upload in chunks, checking size and hashing as it goes
+    - Extracts the PDF text for the chatbot when the content changed
+    - Stores in PostgreSQL database as fixed-size chunks, in the threadpool
     """
 
     if not file.filename:
@@ -57,48 +144,33 @@ async def upload_document(
         raise HTTPException(status_code=400, detail="Type must be 'resume' or 'cv'")
 
     try:
-        # Read file content
-        content = await file.read()
-
-        # Validate file size
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE / 1024 / 1024}MB",
-            )
-
-        # Validate PDF content (magic number check)
-        if not validate_pdf_content(content):
+        # The magic number is checked before anything is stored
+        if not validate_pdf_content(await file.read(len(PDF_MAGIC_NUMBER))):
             raise HTTPException(
                 status_code=400, detail="File content is not a valid PDF"
             )
 
-        # Check if document already exists
-        existing_doc = db.query(Document).filter(Document.type == type).first()
-
-        if existing_doc:
-            # Update existing document
-            existing_doc.filename = sanitize_filename(file.filename)
-            existing_doc.content = content
-            existing_doc.size = len(content)
-            existing_doc.updated_at = datetime.now(timezone.utc)
-        else:
-            # Create new document
-            new_doc = Document(
-                type=type,
-                filename=sanitize_filename(file.filename),
-                content=content,
-                size=len(content),
-            )
-            db.add(new_doc)
-
-        db.commit()
+        # The upload is already spooled; the database work runs off the event loop
+        await file.seek(0)
+        document_id, updated_at, size = await run_in_threadpool(
+            store_upload, db, type, sanitize_filename(file.filename), file.file
+        )
+        invalidate_portfolio_context("documents")
+
+        # Warm the download cache from the spooled upload, not the database
+        await file.seek(0)
+        await run_in_threadpool(
+            document_cache.store,
+            document_id,
+            updated_at,
+            iter(partial(file.file.read, UPLOAD_READ_SIZE), b""),
+        )
 
         return {
             "message": f"{type.upper()} uploaded successfully",
             "filename": sanitize_filename(file.filename),
             "type": type,
-            "size": len(content),
+            "size": size,
         }
     except HTTPException:
         raise
@@ -110,28 +182,98 @@ async def upload_document(
         )
 
 
+def fill_document_cache(document: Document) -> Optional[Path]:
+    """Copy a document from the database into the file cache"""
+    return document_cache.store(
+        document.id, document.updated_at, iter_document_chunks(document.id)
+    )
+
+
+def document_etag(document: Document) -> str:
+    """Strong ETag from the content hash, with a fallback for unhashed rows"""
+    if document.sha256:
+        return f'"{document.sha256}"'
+    return f'"{document.id}-{document.size}-{int(document.updated_at.timestamp())}"'
+
+
 @router.get("/api/resume/download/{type}")
-async def download_document(type: str, db: Session = Depends(get_db)):
+async def download_document(
+    type: str,
+    db: Session = Depends(get_db),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+):
     """
     Download resume or CV (Public endpoint)
+    - Sends ETag (content hash) and Last-Modified validators
+    - Answers If-None-Match / If-Modified-Since with 304 Not Modified
+    - Serves single byte ranges (Range / If-Range) with 206 Partial Content
+    - Serves from the local file cache when possible, falling back to
+      streaming chunks from the database
     """
     if type not in ["resume", "cv"]:
         raise HTTPException(status_code=400, detail="Type must be 'resume' or 'cv'")
 
-    document = db.query(Document).filter(Document.type == type).first()
+    document = await run_in_threadpool(
+        lambda: db.query(Document).filter(Document.type == type).first()
+    )
 
     if not document:
         raise HTTPException(status_code=404, detail=f"{type.upper()} not found")
 
-    # Create a BytesIO object from the binary content
-    pdf_stream = io.BytesIO(document.content)
+    etag = document_etag(document)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(document.updated_at),
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    if not_modified(if_none_match, if_modified_since, etag, document.updated_at):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = (
+        f'attachment; filename="Tunji_Paul_{type.upper()}.pdf"'
+    )
+
+    byte_range = None
+    if if_range_allows(if_range, etag, document.updated_at):
+        try:
+            byte_range = parse_range(range_header, document.size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{document.size}"},
+            )
 
+    cached_path = document_cache.lookup(
+        document.id, document.sha256, document.updated_at
+    )
+    if cached_path is None and document_cache.accepts(document.size):
+        cached_path = await run_in_threadpool(fill_document_cache, document)
+    if cached_path is not None:
+        # FileResponse applies Range / If-Range itself against our validators
+        return FileResponse(cached_path, media_type="application/pdf", headers=headers)
+
+    if byte_range is None:
+        # Stream the stored chunks one at a time instead of loading the whole file
+        headers["Content-Length"] = str(document.size)
+        return StreamingResponse(
+            iter_document_chunks(document.id),
+            media_type="application/pdf",
+            headers=headers,
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{document.size}"
+    headers["Content-Length"] = str(end - start + 1)
     return StreamingResponse(
-        pdf_stream,
+        iter_document_chunks(document.id, start, end),
+        status_code=206,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="Tunji_Paul_{type.upper()}.pdf"'
-        },
+        headers=headers,
     )
 
 
@@ -153,8 +295,13 @@ async def delete_document(
         raise HTTPException(status_code=404, detail=f"{type.upper()} not found")
 
     try:
+        document_id = document.id
+        delete_document_chunks(db, document_id)
+        delete_document_text(db, document_id)
         db.delete(document)
         db.commit()
+        document_cache.discard(document_id)
+        invalidate_portfolio_context("documents")
         return {"message": f"{type.upper()} deleted successfully", "type": type}
     except Exception as e:
         db.rollback()
@@ -164,15 +311,29 @@ async def delete_document(
         )
 
 
+def load_current_files(db: Session) -> dict:
+    """Current resume/CV filenames, shared by the read cache and static export"""
+    filenames = dict(
+        db.query(Document.type, Document.filename)
+        .filter(Document.type.in_(["resume", "cv"]))
+        .all()
+    )
+    return {
+        "resume": filenames.get("resume"),
+        "cv": filenames.get("cv"),
+    }
+
+
 @router.get("/api/resume/current")
-async def get_current_files(db: Session = Depends(get_db)):
+def get_current_files(
+    db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)
+):
     """
     Get information about currently uploaded files (Public endpoint)
     """
-    resume_doc = db.query(Document).filter(Document.type == "resume").first()
-    cv_doc = db.query(Document).filter(Document.type == "cv").first()
-
-    return {
-        "resume": resume_doc.filename if resume_doc else None,
-        "cv": cv_doc.filename if cv_doc else None,
-    }
+    return read_cache.response(
+        "/api/resume/current",
+        ("documents",),
+        lambda: load_current_files(db),
+        if_none_match=if_none_match,
+    )
@@ -0,0 +1,139 @@
+"""
+Portfolio Retrieval Index
+
+This module provides a small, pure-Python BM25 index over text chunks so the
+chatbot can include only the portfolio chunks relevant to a question instead
+of pasting the whole portfolio into every prompt.
+
+Chunks are grouped by source (one source per database table). Sources can be
+replaced individually with with_sources(), which returns a new index and
+updates the term statistics incrementally, so readers holding the old index
+are never affected by a refresh.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by can do does for from has have he his how i in is
+    it its me my of on or she so that the their them they this to was what
+    when where which who why will with you your tunji paul tell about
+    """.split()
+)
+
+
+def normalize_term(token: str) -> str:
+    """Strip trailing dots and a plural s, so projects. matches project"""
+    token = token.rstrip(".")
+    if (
+        token.isalpha()
+        and len(token) > 3
+        and token.endswith("s")
+        and not token.endswith("ss")
+    ):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase text and split it into index terms, dropping stopwords"""
+    terms = (normalize_term(token) for token in TOKEN_PATTERN.findall(text.lower()))
+    return [term for term in terms if term and term not in STOPWORDS]
+
+
+class BM25Index:
+    """Immutable-by-convention BM25 index over chunks grouped by source"""
+
+    def __init__(self, sources: dict[str, list[str]] | None = None):
+        # source -> list of (text, term frequencies, length)
+        self._sources: dict[str, list[tuple[str, Counter, int]]] = {}
+        self._df: Counter = Counter()
+        self._total_length = 0
+        self._count = 0
+        for source, chunks in (sources or {}).items():
+            self._add(source, chunks)
+
+    def _add(self, source: str, chunks: list[str]):
+        docs = []
+        for text in chunks:
+            terms = Counter(tokenize(text))
+            length = sum(terms.values())
+            docs.append((text, terms, length))
+            self._df.update(terms.keys())
+            self._total_length += length
+            self._count += 1
+        self._sources[source] = docs
+
+    def _remove(self, source: str):
+        for _, terms, length in self._sources.get(source, []):
+            self._df.subtract(terms.keys())
+            self._total_length -= length
+            self._count -= 1
+        self._df += Counter()  # drop terms whose count fell to zero
+
+    def with_sources(self, updated: dict[str, list[str]]) -> "BM25Index":
+        """Return a copy of the index with the given sources replaced"""
+        index = BM25Index()
+        index._sources = dict(self._sources)
+        index._df = self._df.copy()
+        index._total_length = self._total_length
+        index._count = self._count
+        for source, chunks in updated.items():
+            # _add overwrites the entry, keeping the source's position in order
+            index._remove(source)
+            index._add(source, chunks)
+        return index
+
+    def chunks(self, source: str | None = None) -> list[str]:
+        """Return every chunk in source order, or just one source's chunks"""
+        if source is not None:
+            return [text for text, _, _ in self._sources.get(source, [])]
+        return [text for docs in self._sources.values() for text, _, _ in docs]
+
+    def search(self, query: str, k: int) -> list[str]:
+        """
+        Return up to k chunks ranked by BM25 score for the query.
+
+        Chunks that share no terms with the query are never returned.
+        """
+        query_terms = set(tokenize(query))
+        if not query_terms or not self._count:
+            return []
+
+        avg_length = self._total_length / self._count or 1
+        idf = {
+            term: math.log(
+                1 + (self._count - self._df[term] + 0.5) / (self._df[term] + 0.5)
+            )
+            for term in query_terms
+            if self._df[term]
+        }
+        if not idf:
+            return []
+
+        scored = []
+        position = 0
+        for docs in self._sources.values():
+            for text, terms, length in docs:
+                score = 0.0
+                for term, term_idf in idf.items():
+                    tf = terms.get(term)
+                    if tf:
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                        score += term_idf * tf * (BM25_K1 + 1) / (tf + norm)
+                if score > 0:
+                    scored.append((score, -position, text))
+                position += 1
+
+        return [text for _, _, text in heapq.nlargest(k, scored)]
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,70 @@
+"""
+Single-Row Writes
+
+Helpers for the admin PUT/DELETE routes. Each write is a single UPDATE ...
+RETURNING or DELETE ... RETURNING statement followed by the commit, instead
+of a SELECT to load the row, the mutation, and a refresh to read it back.
+No returned row means the id doesn't exist (404). Constraint violations
+raised by the statement itself take the place of separate uniqueness
+probes (400).
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def update_row(
+    db: Session,
+    model,
+    row_id: int,
+    values: dict,
+    not_found: str,
+    conflict: str = "Invalid data",
+) -> dict:
+    """
+    Update one row by id and return its new column values.
+
+    Raises:
+        HTTPException: 404 with not_found if there is no such row, 400 with
+            conflict if the update violates a constraint
+    """
+    columns = model.__table__.columns
+    if values:
+        statement = (
+            update(model).where(model.id == row_id).values(**values).returning(*columns)
+        )
+    else:
+        # Nothing to change; just read the row back
+        statement = select(*columns).where(model.id == row_id)
+
+    try:
+        row = db.execute(
+            statement, execution_options={"synchronize_session": False}
+        ).first()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=conflict)
+    if row is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=not_found)
+    db.commit()
+    return dict(row._mapping)
+
+
+def delete_row(db: Session, model, row_id: int, not_found: str):
+    """
+    Delete one row by id.
+
+    Raises:
+        HTTPException: 404 with not_found if there is no such row
+    """
+    deleted = db.scalar(
+        delete(model).where(model.id == row_id).returning(model.id),
+        execution_options={"synchronize_session": False},
+    )
+    if deleted is None:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=not_found)
+    db.commit()
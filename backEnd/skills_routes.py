@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
 from database import get_db, Skill
+from portfolio_cache import invalidate_portfolio_context
+from read_cache import read_cache, serialize_rows
+from bulk_ops import BulkPlan, BulkRequest, BulkResponse, apply_bulk
+from row_writes import update_row, delete_row
 from datetime import datetime
 from auth_utils import get_current_user
 
@@ -35,11 +40,82 @@ class SkillResponse(SkillBase):
         from_attributes = True
 
 
+def load_skills(db: Session) -> list:
+    """Serialized skills, shared by the read cache and static export"""
+    return serialize_rows(SkillResponse, db.query(Skill).all())
+
+
 @router.get("", response_model=List[SkillResponse])
-def get_all_skills(db: Session = Depends(get_db)):
-    """Get all skills"""
-    skills = db.query(Skill).all()
-    return skills
+def get_all_skills(
+    db: Session = Depends(get_db), if_none_match: Optional[str] = Header(None)
+):
+    """Get all skills (served from the read cache)"""
+    return read_cache.response(
+        "/api/skills",
+        ("skills",),
+        lambda: load_skills(db),
+        if_none_match=if_none_match,
+    )
+
+
+def skill_name_conflicts(db: Session, plan: BulkPlan) -> dict[int, str]:
+    """
+    Find bulk operations that would leave two skills with the same name.
+
+    Existing holders of the requested names are fetched in one query; a
+    holder that the same request deletes no longer counts. Renames are
+    applied one row at a time, so a skill can't take a name another skill
+    gives up in the same request (e.g. swapping two names).
+    """
+    claims = {}  # name -> indexes of the operations giving a skill that name
+    for index, values in plan.creates:
+        claims.setdefault(values["name"], []).append(index)
+    for index, _, values in plan.updates:
+        if values.get("name"):
+            claims.setdefault(values["name"], []).append(index)
+    if not claims:
+        return {}
+
+    deleted = {row_id for _, row_id in plan.deletes}
+    renamed = {row_id for _, row_id, values in plan.updates if values.get("name")}
+    updated = {index: row_id for index, row_id, _ in plan.updates}
+    errors = {}
+    for skill_id, name in db.query(Skill.id, Skill.name).filter(Skill.name.in_(claims)):
+        if skill_id in deleted:
+            continue
+        keeps = any(updated.get(index) == skill_id for index in claims[name])
+        for index in claims[name]:
+            if updated.get(index) == skill_id:
+                continue  # keeping its own name
+            if skill_id in renamed and not keeps:
+                errors[index] = (
+                    "Skill name is released by a rename in this request; "
+                    "rename in a separate request"
+                )
+            else:
+                errors[index] = "Skill with this name already exists"
+    for name, indexes in claims.items():
+        if len(indexes) > 1:
+            for index in indexes:
+                errors.setdefault(index, "Skill name appears more than once")
+    return errors
+
+
+@router.post("/bulk", response_model=BulkResponse[SkillResponse])
+def bulk_skills(
+    request: BulkRequest[SkillUpdate],
+    db: Session = Depends(get_db),
+    current_user: str = Depends(get_current_user),
+):
+    """
+    Create, update and delete skills in one transaction
+    - Each operation: {"op": "create" | "update" | "delete", "id": ..., "data": {...}}
+    - All or nothing: any invalid operation (unknown id, duplicate name)
+      rejects the whole request with per-item errors
+    """
+    return apply_bulk(
+        db, Skill, request, SkillCreate, SkillResponse, check=skill_name_conflicts
+    )
 
 
 @router.get("/{skill_id}", response_model=SkillResponse)
@@ -58,13 +134,6 @@ def create_skill(
     current_user: str = Depends(get_current_user),
 ):
     """Create a new skill"""
-    # Check if skill with same name already exists
-    existing_skill = db.query(Skill).filter(Skill.name == skill.name).first()
-    if existing_skill:
-        raise HTTPException(
-            status_code=400, detail="Skill with this name already exists"
-        )
-
     new_skill = Skill(
         name=skill.name,
         category=skill.category,
@@ -72,7 +141,15 @@ def create_skill(
         proficiency=skill.proficiency or 50,
     )
     db.add(new_skill)
-    db.commit()
+    # The unique constraint on name rejects duplicates
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Skill with this name already exists"
+        )
+    invalidate_portfolio_context("skills")
     db.refresh(new_skill)
     return new_skill
 
@@ -85,23 +162,15 @@ def update_skill(
     current_user: str = Depends(get_current_user),
 ):
     """Update a skill"""
-    db_skill = db.query(Skill).filter(Skill.id == skill_id).first()
-    if not db_skill:
-        raise HTTPException(status_code=404, detail="Skill not found")
-
-    if skill.name and skill.name != db_skill.name:
-        existing_skill = db.query(Skill).filter(Skill.name == skill.name).first()
-        if existing_skill:
-            raise HTTPException(
-                status_code=400, detail="Skill with this name already exists"
-            )
-
-    update_data = skill.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_skill, key, value)
-
-    db.commit()
-    db.refresh(db_skill)
+    db_skill = update_row(
+        db,
+        Skill,
+        skill_id,
+        skill.dict(exclude_unset=True),
+        not_found="Skill not found",
+        conflict="Skill with this name already exists",
+    )
+    invalidate_portfolio_context("skills")
     return db_skill
 
 
@@ -112,10 +181,6 @@ def delete_skill(
     current_user: str = Depends(get_current_user),
 ):
     """Delete a skill"""
-    db_skill = db.query(Skill).filter(Skill.id == skill_id).first()
-    if not db_skill:
-        raise HTTPException(status_code=404, detail="Skill not found")
-
-    db.delete(db_skill)
-    db.commit()
+    delete_row(db, Skill, skill_id, not_found="Skill not found")
+    invalidate_portfolio_context("skills")
     return None
@@ -0,0 +1,55 @@
+"""
+Startup Timing
+
+This module records how long each router module takes to import and how long
+lazily-built clients take to construct, so slow cold starts on
+scale-to-zero hosting can be traced to a specific dependency.
+
+Usage:
+    with import_timer("chatbot_routes"):
+        from chatbot_routes import router as chatbot_router
+
+The collected timings are printed at boot and served by GET /health/startup.
+"""
+
+import time
+from contextlib import contextmanager
+
+PROCESS_START = time.perf_counter()
+
+# name -> milliseconds, in the order they were recorded
+import_timings: dict[str, float] = {}
+lazy_timings: dict[str, float] = {}
+
+
+@contextmanager
+def import_timer(name: str):
+    """Record the wall-clock time spent importing inside the block under name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        import_timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def record_lazy_timing(name: str, milliseconds: float):
+    """Store how long a lazily built client took to construct"""
+    lazy_timings[name] = round(milliseconds, 2)
+
+
+def startup_report() -> dict:
+    """Return the recorded timings and time since this module was imported"""
+    return {
+        "imports_ms": dict(import_timings),
+        "total_import_ms": round(sum(import_timings.values()), 2),
+        "lazy_init_ms": dict(lazy_timings),
+        "uptime_ms": round((time.perf_counter() - PROCESS_START) * 1000, 2),
+    }
+
+
+def print_startup_report():
+    """Print the per-module import timings, slowest first"""
+    print("Startup import timings:")
+    for name, ms in sorted(import_timings.items(), key=lambda item: -item[1]):
+        print(f"  {name:<24} {ms:>9.2f} ms")
+    print(f"  {'total':<24} {sum(import_timings.values()):>9.2f} ms")
@@ -0,0 +1,211 @@
+"""
+Static Export
+
+Dumps every public read endpoint to static JSON files so a CDN can serve the
+site's content without reaching the backend. Each endpoint is written under
+a content-hashed name (projects.<hash>.json) next to precompressed .gz and
+.br copies (.br needs the brotli package from requirements.txt). manifest.json
+maps each endpoint path to its current file, so hashed files can be cached
+forever and only the manifest needs revalidating.
+
+The bytes are produced by the same loaders and encoder as the read cache, so
+a static file is identical to the live API response.
+
+Usage:
+    python static_export.py [--out DIR] [--only projects skills ...]
+
+With STATIC_EXPORT_ON_WRITE=true the app also re-exports, on a background
+thread, just the files affected by each admin write.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from database import SessionLocal
+from about_routes import load_about
+from hero_routes import load_heroes
+from projects_routes import load_projects
+from skills_routes import load_skills
+from resume_routes import load_current_files
+from portfolio_routes import build_portfolio, PORTFOLIO_TABLES
+from portfolio_cache import add_invalidation_listener
+from read_cache import encode_json
+
+STATIC_EXPORT_DIR = os.getenv("STATIC_EXPORT_DIR", "static_export")
+STATIC_EXPORT_ON_WRITE = os.getenv("STATIC_EXPORT_ON_WRITE", "false").lower() == "true"
+
+HASH_LENGTH = 12
+MANIFEST_NAME = "manifest.json"
+
+# Export name -> (endpoint path, tables it is built from, loader)
+EXPORTS = {
+    "portfolio": ("/api/portfolio", PORTFOLIO_TABLES, build_portfolio),
+    "hero": ("/api/hero", ("hero",), load_heroes),
+    "about": ("/api/about", ("about",), load_about),
+    "projects": ("/api/projects", ("projects",), load_projects),
+    "skills": ("/api/skills", ("skills",), load_skills),
+    "resume": ("/api/resume/current", ("documents",), load_current_files),
+}
+
+
+def exports_for_table(table: Optional[str]) -> list[str]:
+    """Names of the exports built from a table (all of them for None)"""
+    if table is None:
+        return list(EXPORTS)
+    return [name for name, (_, tables, _) in EXPORTS.items() if table in tables]
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file under a temporary name, then rename it into place"""
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_bytes(data)
+    os.replace(temp, path)
+
+
+class StaticExporter:
+    """Writes hashed, precompressed JSON files and their manifest"""
+
+    def __init__(self, directory: str = STATIC_EXPORT_DIR):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def _load_manifest(self) -> dict:
+        try:
+            return json.loads((self.directory / MANIFEST_NAME).read_bytes())
+        except (FileNotFoundError, ValueError):
+            return {"files": {}}
+
+    def _write(self, name: str, body: bytes) -> dict:
+        digest = hashlib.sha256(body).hexdigest()
+        filename = f"{name}.{digest[:HASH_LENGTH]}.json"
+        path = self.directory / filename
+
+        # Content-addressed: an unchanged export is already on disk
+        if not path.exists():
+            write_atomic(
+                path.with_name(filename + ".gz"), gzip.compress(body, 9, mtime=0)
+            )
+            if brotli is not None:
+                write_atomic(
+                    path.with_name(filename + ".br"), brotli.compress(body, quality=11)
+                )
+            write_atomic(path, body)
+
+        return {
+            "file": filename,
+            "sha256": digest,
+            "size": len(body),
+            "encodings": ["gzip"] + (["br"] if brotli is not None else []),
+        }
+
+    def _remove_stale(self, name: str, keep: str):
+        for path in self.directory.glob(f"{name}.*.json*"):
+            if not path.name.startswith(keep) or path.name.endswith(".tmp"):
+                path.unlink(missing_ok=True)
+
+    def export(self, names: Optional[list[str]] = None) -> dict:
+        """
+        Export the given endpoints (default: all) and update the manifest.
+
+        Returns:
+            The updated manifest
+        """
+        names = list(EXPORTS) if names is None else names
+        db = SessionLocal()
+        try:
+            bodies = {name: encode_json(EXPORTS[name][2](db)) for name in names}
+        finally:
+            db.close()
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            manifest = self._load_manifest()
+            for name, body in bodies.items():
+                manifest["files"][EXPORTS[name][0]] = self._write(name, body)
+            manifest["generated_at"] = datetime.now(timezone.utc).isoformat()
+            write_atomic(
+                self.directory / MANIFEST_NAME,
+                json.dumps(manifest, indent=2, sort_keys=True).encode(),
+            )
+
+            # Old versions go only once the manifest no longer points at them
+            for name in names:
+                self._remove_stale(name, manifest["files"][EXPORTS[name][0]]["file"])
+        return manifest
+
+
+class ExportOnWrite:
+    """Re-exports the files affected by each write on a background thread"""
+
+    def __init__(self, exporter: StaticExporter):
+        self.exporter = exporter
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="static-export", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        add_invalidation_listener(self.schedule)
+
+    def schedule(self, table: Optional[str]):
+        """Queue the exports built from a table; bursts of writes coalesce"""
+        with self._lock:
+            self._pending.update(exports_for_table(table))
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                names = sorted(self._pending)
+                self._pending.clear()
+            if not names:
+                continue
+            try:
+                self.exporter.export(names)
+                print(f"Static export updated: {', '.join(names)}")
+            except Exception as e:
+                print(f"Static export error: {str(e)}")
+
+
+def enable_export_on_write(directory: str = STATIC_EXPORT_DIR) -> ExportOnWrite:
+    """Start re-exporting static files after admin writes"""
+    worker = ExportOnWrite(StaticExporter(directory))
+    worker.start()
+    return worker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export public API data to static JSON files"
+    )
+    parser.add_argument("--out", default=STATIC_EXPORT_DIR, help="Output directory")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(EXPORTS), help="Export only these"
+    )
+    args = parser.parse_args()
+
+    manifest = StaticExporter(args.out).export(args.only)
+    for endpoint, entry in sorted(manifest["files"].items()):
+        print(f"{endpoint:22} -> {entry['file']} ({entry['size']} bytes)")
+    if brotli is None:
+        print(
+            "Warning: brotli is not installed (pip install brotli); "
+            "wrote gzip copies only, no .br files."
+        )